@@ -1,12 +1,19 @@
 # vbg_tools/artifact_helpers.py
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Tuple
 import yaml
 import ast
 import re
 
+# libyaml-backed safe loader/dumper when available; shared by the other modules and tests
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:  # libyaml not available
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
 _DICTLIKE_RE = re.compile(r"^\s*\{.*\}\s*$")
 
 # ---------- IO ----------
@@ -20,6 +27,17 @@ def load_yaml_file(p: str | Path) -> dict:
     return data or {}
 
 
+def _load_yaml_stream(p: Path) -> Any:
+    # Hand the byte stream to the loader so libyaml reads/decodes it in chunks
+    with p.open("rb") as f:
+        return yaml.load(f, Loader=_Loader)
+
+
+def load_artifacts(vp: Path, bp: Path, gp: Path) -> Tuple[Any, Any, str]:
+    """Load (vocab, binder, grammar) artifacts."""
+    return _load_yaml_stream(vp), _load_yaml_stream(bp), gp.read_text(encoding="utf-8")
+
+
 def write_yaml_file(path: Path, obj: dict) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8") as fh:
@@ -43,9 +61,19 @@ CORE_CONNECTORS = {
 }
 
 
+@lru_cache(maxsize=4096)
+def _normalize_aliases_cached(xs: Tuple[str, ...]) -> Tuple[str, ...]:
+    return tuple(sorted({s for x in xs if (s := x.strip())}))
+
+
 def normalize_aliases(xs: Iterable[str]) -> list[str]:
-    uniq = {str(x).strip() for x in (xs or []) if str(x).strip()}
-    return sorted(uniq)
+    # Many actions share identical alias lists (often empty), so memoize on a tuple
+    # key; hand back a fresh list so callers may mutate it. Only all-str inputs are
+    # cached: 1 == True == 1.0 would otherwise collide despite different str() forms.
+    key = tuple(xs or ())
+    if all(type(x) is str for x in key):
+        return list(_normalize_aliases_cached(key))
+    return sorted({s for x in key if (s := str(x).strip())})
 
 
 def coerce_types(v: Any) -> list[str]:
@@ -166,6 +194,9 @@ def _parse_dictlike_literal(s: str) -> Dict[str, Any] | None:
         return None
 
 
+_ALIAS_NAME_PRIORITY = ("identifier", "label", "title", "names")
+
+
 def _preferred_name_from_meta(meta: Dict[str, Any]) -> str:
     """
     Derive a readable column name from parsed meta:
@@ -177,23 +208,23 @@ def _preferred_name_from_meta(meta: Dict[str, Any]) -> str:
     # aliases may be any case; we want the literal string for output, not lowercased
     aliases = meta.get("aliases") or []
     if isinstance(aliases, (list, tuple)) and aliases:
-        # Case-insensitive check for 'name' among aliases
+        # One pass: lowercased alias -> first original-cased (stripped) spelling
+        by_lower: Dict[str, str] = {}
+        first = ""
         for a in aliases:
-            if isinstance(a, str) and a.strip().lower() == "name":
-                return "name"
-        # Next preference list, case-insensitive
-        prefs = ["identifier", "label", "title", "names"]
-        lowered = [a.strip().lower() for a in aliases if isinstance(a, str)]
-        for p in prefs:
-            if p in lowered:
-                # return the original-cased alias which matched
-                for a in aliases:
-                    if isinstance(a, str) and a.strip().lower() == p:
-                        return a.strip()
+            if isinstance(a, str):
+                sa = a.strip()
+                by_lower.setdefault(sa.lower(), sa)
+                if not first:
+                    first = sa
+        if "name" in by_lower:
+            return "name"
+        for p in _ALIAS_NAME_PRIORITY:
+            if p in by_lower:
+                return by_lower[p]
         # Else just use the first alias
-        for a in aliases:
-            if isinstance(a, str) and a.strip():
-                return a.strip()
+        if first:
+            return first
 
     # Else try 'name' in meta
     if isinstance(meta.get("name"), str) and meta["name"].strip():
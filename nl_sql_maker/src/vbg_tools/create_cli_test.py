@@ -9,6 +9,8 @@ from typing import Any, Dict, List, Optional
 
 import yaml
 
+from .artifact_helpers import _Loader
+
 # Jinja2 is preferred, but we provide a fallback if unavailable.
 try:
     from jinja2 import Environment, BaseLoader, StrictUndefined
@@ -100,8 +102,8 @@ def _load_yaml_list_any(path: Path) -> List[Dict[str, Any]]:
     """
     if not path.exists():
         return []
-    with open(path, "r", encoding="utf-8") as f:
-        raw = yaml.safe_load(f) or []
+    with open(path, "rb") as f:
+        raw = yaml.load(f, Loader=_Loader) or []
     if not isinstance(raw, list):
         raise ValueError(f"Expected YAML list at {path}, got {type(raw).__name__}")
 
@@ -126,8 +128,8 @@ def _load_yaml_list_any(path: Path) -> List[Dict[str, Any]]:
 def _load_yaml_dict(path: Path) -> Dict[str, Any]:
     if not path.exists():
         return {}
-    with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    with open(path, "rb") as f:
+        return yaml.load(f, Loader=_Loader) or {}
 
 
 def _discover_featured(vocab: Dict[str, Any], binder: Dict[str, Any]) -> List[Dict[str, str]]:
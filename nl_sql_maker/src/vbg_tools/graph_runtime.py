@@ -3,10 +3,12 @@
 from __future__ import annotations
 import os, sys, re, json
 from dataclasses import dataclass, field
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any, Dict, List, Tuple, Optional
+from typing import Any, Callable, Dict, List, Tuple, Optional
 
 from lark import Lark, UnexpectedInput
+from lark.exceptions import GrammarError
 from types import SimpleNamespace
 
 # --- SQL helpers ---
@@ -64,6 +66,8 @@ class RuntimeResult:
     tree: Optional[str] = None  # textual tree on demand
 
 # ----------------- slots & canonicalization -----------------
+_PROJECTION_ACTION_ROLES = frozenset(("sql_action", "action", "function"))
+
 def harvest_and_canonicalize(
     text: str,
     tokens: List[str],
@@ -81,8 +85,17 @@ def harvest_and_canonicalize(
     - We *do not* mark table/column tokens as 'consumed' for the purpose of warnings; unmapped tokens
       remain visible to help diagnose coverage gaps (matching current tests' expectation).
     """
-    # 1) Decide presence of SELECT via a select_verb span
-    has_select = any(getattr(s, "role", "") == "select_verb" or s.canonical == "select" for s in spans)
+    # 1) One pass over spans: SELECT presence, first projection action, covered token positions
+    has_select = False
+    action_span = None
+    covered = set()
+    for s in spans:
+        role = getattr(s, "role", "")
+        if role == "select_verb" or s.canonical == "select":
+            has_select = True
+        if action_span is None and role in _PROJECTION_ACTION_ROLES:
+            action_span = s
+        covered.update(range(s.start, s.end))
 
     # 2) Detect first table mention from raw tokens (lowercased)
     table_lc = None
@@ -94,7 +107,6 @@ def harvest_and_canonicalize(
     table_name = tables_by_lc.get(table_lc) if table_lc else None
 
     # 3) See if any sql_action (projection) was matched
-    action_span = next((s for s in spans if getattr(s, "role", "") in ("sql_action", "action", "function")), None)
     action_name = action_span.canonical if action_span else None
 
     # 4) Canonical tokens (structure only)
@@ -118,29 +130,54 @@ def harvest_and_canonicalize(
     }
 
     # 6) Warnings for unmapped tokens (tokens not covered by matched spans)
-    covered = set()
-    for s in spans:
-        covered.update(range(s.start, s.end))
-    unmapped = [tokens[i] for i in range(len(tokens)) if i not in covered]
+    unmapped = [tok for i, tok in enumerate(tokens) if i not in covered]
     warnings: List[str] = []
     if unmapped:
         warnings.append(f"Unmapped tokens: {unmapped}")
 
-    # 7) Return a simple object with expected attributes
+    # 7) Return a simple object with expected attributes (unmapped_tokens is the structured form of the warning)
     return SimpleNamespace(
         canonical_tokens=canonical,
         slots=slots,
         warnings=warnings,
+        unmapped_tokens=unmapped,
     )
 
 
 
 
 # ----------------- Lark parse -----------------
-def try_parse_with_lark(grammar_text: str, canonical_tokens: List[str], want_tree: bool) -> Tuple[bool, Optional[str], Optional[str]]:
+# Lexer paired with each Lark algorithm; "lalr" suits unambiguous grammars and parses in linear time
+_LARK_LEXERS = {"earley": "dynamic_complete", "lalr": "contextual"}
+
+
+@lru_cache(maxsize=8)
+def _compile_lark(grammar_text: str, parser_algorithm: str) -> Lark:
+    """
+    Compile once per (grammar, algorithm); parsing does not mutate the Lark instance.
+    "auto" tries LALR first and falls back to Earley when the grammar has LALR conflicts.
+    """
+    if parser_algorithm == "auto":
+        try:
+            return _compile_lark(grammar_text, "lalr")
+        except GrammarError:
+            return _compile_lark(grammar_text, "earley")
+    return Lark(grammar_text, parser=parser_algorithm, lexer=_LARK_LEXERS.get(parser_algorithm, "auto"))
+
+
+def try_parse_with_lark(
+    grammar_text: str,
+    canonical_tokens: List[str],
+    want_tree: bool,
+    *,
+    parser_algorithm: str = "auto",
+    parser: Optional[Lark] = None,
+) -> Tuple[bool, Optional[str], Optional[str]]:
+    """A prebuilt `parser` is used as-is; otherwise a cached one is compiled from grammar_text."""
     text = " ".join(canonical_tokens).strip()
     try:
-        parser = Lark(grammar_text, parser="earley", lexer="dynamic_complete")
+        if parser is None:
+            parser = _compile_lark(grammar_text, parser_algorithm)
         tree = parser.parse(text)
         return True, None, (tree.pretty() if want_tree else None)
     except UnexpectedInput as e:
@@ -148,6 +185,23 @@ def try_parse_with_lark(grammar_text: str, canonical_tokens: List[str], want_tre
     except Exception as e:
         return False, f"{type(e).__name__}: {e}", None
 
+# ----------------- prebuilt indices -----------------
+def build_vocab_index(vocabulary: Dict[str, Any]):
+    """
+    Returns (connectors_map, trie, max_len) for a vocabulary.
+    Build once and pass as map_text(vocab_index=...) to reuse it across queries;
+    rebuild it after editing the vocabulary.
+    """
+    res = build_lexicon_and_connectors(vocabulary)
+    if isinstance(res, tuple) and len(res) == 2:
+        lex, connectors_map = res
+    else:
+        lex = res
+        connectors_map = (vocabulary.get("keywords") or {}).get("connectors") or {}
+    trie, max_len = build_index(lex)
+    return connectors_map, trie, max_len
+
+
 # ----------------- core mapping -----------------
 def map_text(
     text: str,
@@ -155,24 +209,29 @@ def map_text(
     binder_artifact: Dict[str, Any],
     grammar_text: str,
     *,
-    want_tree: bool = False
+    want_tree: bool = False,
+    parser_algorithm: str = "auto",
+    parser: Optional[Lark] = None,
+    vocab_index: Optional[Tuple[Dict[str, str], Dict[Any, Any], int]] = None,
+    schema_index: Optional[Tuple[Dict[str, str], Dict[str, str], Dict[str, Any]]] = None,
 ) -> "RuntimeResult":
-    # 1) Lexicon (+ connectors)
-    blac = build_lexicon_and_connectors
-    res = blac(vocabulary)
-    if isinstance(res, tuple) and len(res) == 2:
-        lex, connectors_map = res
-    else:
-        lex = res
-        connectors_map = (vocabulary.get("keywords") or {}).get("connectors") or {}
+    """
+    A prebuilt `vocab_index` (see build_vocab_index) or `schema_index` (see build_schema_indices)
+    is used as-is; otherwise each is built from the vocabulary/binder passed in.
+    """
+    # 1) Lexicon (+ connectors) and alias trie
+    if vocab_index is None:
+        vocab_index = build_vocab_index(vocabulary)
+    connectors_map, trie, max_len = vocab_index
 
     # 2) Schema indices
-    tables_by_lc, columns_by_lc, _ = build_schema_indices(binder_artifact)
+    if schema_index is None:
+        schema_index = build_schema_indices(binder_artifact)
+    tables_by_lc, columns_by_lc, _ = schema_index
 
     # 3) Tokenize + match
     tokens = tokenize(text)
-    by_len, max_len = build_index(lex)
-    spans = match_aliases(tokens, by_len, max_len)
+    spans = match_aliases(tokens, trie, max_len)
 
     # 4) Canonical + base slots
     harvest = harvest_and_canonicalize(text, tokens, spans, tables_by_lc, columns_by_lc, connectors_map)
@@ -190,7 +249,10 @@ def map_text(
         harvest.warnings.append(f"constraints_error: {e!r}")
 
     # 6) Parse canonical with Lark
-    ok, err, tree = try_parse_with_lark(grammar_text, harvest.canonical_tokens, want_tree=want_tree)
+    ok, err, tree = try_parse_with_lark(
+        grammar_text, harvest.canonical_tokens, want_tree=want_tree,
+        parser_algorithm=parser_algorithm, parser=parser,
+    )
 
     # 7) Package result
     try:
@@ -251,10 +313,11 @@ def run_parse_case(
     vocab_yaml: Dict[str, Any],
     binder_yaml: Dict[str, Any],
     grammar_text: str,
-    case: ParseCase
+    case: ParseCase,
+    map_text_fn: Callable[..., "RuntimeResult"] = map_text,
 ) -> Tuple[StepResult, Dict[str, Any]]:
     _step, payload = execute_parse(
-        map_text=map_text,
+        map_text=map_text_fn,
         text=case.utterance,
         vocab_yaml=vocab_yaml,
         binder_yaml=binder_yaml,
@@ -274,10 +337,11 @@ def run_sql_case(
     grammar_text: str,
     db_path: Optional[str],
     limit: int,
-    case: SQLCase
+    case: SQLCase,
+    map_text_fn: Callable[..., "RuntimeResult"] = map_text,
 ) -> Tuple[StepResult, Dict[str, Any]]:
     _step, payload = execute_parse(
-        map_text=map_text,
+        map_text=map_text_fn,
         text=case.utterance,
         vocab_yaml=vocab_yaml,
         binder_yaml=binder_yaml,
@@ -311,6 +375,12 @@ def run_tests(
     sql_cases: List[SQLCase],
 ) -> Tuple[int, Dict[str, int]]:
     totals = dict(total=0, ok_pass=0, ok_fail=0, unexpected_fail=0, unexpected_success=0)
+    # Every case shares the same artifacts: build the lexicon trie and schema indices once
+    map_text_fn = partial(
+        map_text,
+        vocab_index=build_vocab_index(vocab_yaml),
+        schema_index=build_schema_indices(binder_yaml),
+    )
     def print_parse(label: str, payload: Dict[str, Any], res: StepResult):
         joined = " ".join(payload.get("canonical_tokens") or [])
         table = ((payload.get("slots") or {}).get("table")) or ""
@@ -332,7 +402,8 @@ def run_tests(
     for i, c in enumerate(parse_cases, 1):
         print(f"\n── Test #{i} [parse] {c.label}\n   NL:   {c.utterance}")
         res, payload = run_parse_case(
-            vocab_yaml=vocab_yaml, binder_yaml=binder_yaml, grammar_text=grammar_text, case=c
+            vocab_yaml=vocab_yaml, binder_yaml=binder_yaml, grammar_text=grammar_text, case=c,
+            map_text_fn=map_text_fn,
         )
         print_parse(c.label, payload, res)
         ok_expected = c.want_parse_ok
@@ -353,7 +424,7 @@ def run_tests(
         print(f"\n── Test #{idx} [sql] {c.label}\n   NL:   {c.utterance}")
         res, payload = run_sql_case(
             vocab_yaml=vocab_yaml, binder_yaml=binder_yaml, grammar_text=grammar_text,
-            db_path=db_path, limit=limit, case=c
+            db_path=db_path, limit=limit, case=c, map_text_fn=map_text_fn,
         )
         print_parse(c.label, payload, res)
         print_sql(payload)
@@ -22,6 +22,11 @@ def _all_non_empty_strs(xs: Iterable[Any]) -> bool:
         return False
 
 
+def _is_str_list(xs: Any) -> bool:
+    """True for a list (possibly empty) whose items are all non-empty strings."""
+    return isinstance(xs, list) and _all_non_empty_strs(xs)
+
+
 def _require(cond: bool, msg: str, errors: list[str]) -> None:
     if not cond:
         errors.append(msg)
@@ -97,7 +102,7 @@ def validate_keywords_and_functions(obj: dict) -> None:
                 continue
 
             aliases = meta.get("aliases")
-            if not isinstance(aliases, list) or not aliases or not _all_non_empty_strs(aliases):
+            if not aliases or not _is_str_list(aliases):
                 errors.append(f"{ctx}.aliases must be a non-empty list of non-empty strings.")
 
             template = meta.get("template")
@@ -110,7 +115,7 @@ def validate_keywords_and_functions(obj: dict) -> None:
                     errors.append(f"{ctx}.applicable_types must be a mapping of arg -> list of strings.")
                 else:
                     for arg, types in apt.items():
-                        if not isinstance(types, list) or not _all_non_empty_strs(types):
+                        if not _is_str_list(types):
                             errors.append(f"{ctx}.applicable_types['{arg}'] must be a list of strings.")
 
             for opt_key in ("placement", "bind_style"):
@@ -123,7 +128,7 @@ def validate_keywords_and_functions(obj: dict) -> None:
         for can, meta in sv.items():
             if isinstance(meta, dict) and "aliases" in meta:
                 aliases = meta.get("aliases")
-                if not isinstance(aliases, list) or not _all_non_empty_strs(aliases):
+                if not _is_str_list(aliases):
                     errors.append(f"keywords.select_verbs[{can}].aliases must be a list of non-empty strings.")
 
     comps = kw.get("comparison_operators", {})
@@ -131,7 +136,7 @@ def validate_keywords_and_functions(obj: dict) -> None:
         for can, meta in comps.items():
             if isinstance(meta, dict) and "aliases" in meta:
                 aliases = meta.get("aliases")
-                if not isinstance(aliases, list) or not _all_non_empty_strs(aliases):
+                if not _is_str_list(aliases):
                     errors.append("keywords.comparison_operators aliases must be a list of non-empty strings.")
                     break
 
@@ -140,7 +145,7 @@ def validate_keywords_and_functions(obj: dict) -> None:
         sk = fw["_skip"]
         if isinstance(sk, dict) and "aliases" in sk:
             aliases = sk.get("aliases")
-            if not isinstance(aliases, list) or not _all_non_empty_strs(aliases):
+            if not _is_str_list(aliases):
                 errors.append("keywords.filler_words._skip.aliases must be a list of non-empty strings.")
 
     if errors:
@@ -298,7 +303,7 @@ def validate_schema(obj: dict) -> None:
                     errors.append(f"{ctx}.template must be a non-empty string if provided.")
                 aliases = meta.get("aliases")
                 if aliases is not None:
-                    if not isinstance(aliases, list) or not _all_non_empty_strs(aliases):
+                    if not _is_str_list(aliases):
                         errors.append(f"{ctx}.aliases must be a list of non-empty strings if provided.")
                 for opt in ("placement", "bind_style"):
                     if opt in meta and not _is_non_empty_str(meta.get(opt)):
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import re
+import sys
 from typing import Any, Dict, Iterable, List, Tuple, Optional
 from dataclasses import dataclass
 
@@ -11,8 +12,21 @@ _VAL_RE = r"(?:'[^']*'|\d+(?:\.\d+)?)"  # quoted string or number
 # Public data shapes expected by graph_runtime.py and tests
 # --------------------------------------------------------------------------------------
 
+class _FrozenSlots:
+    """Pickle/copy support for frozen dataclasses that declare __slots__ (no __dict__)."""
+    __slots__ = ()
+
+    def __getstate__(self):
+        return tuple(getattr(self, f) for f in self.__slots__)
+
+    def __setstate__(self, state):
+        for f, v in zip(self.__slots__, state):
+            object.__setattr__(self, f, v)
+
+
 @dataclass(frozen=True)
-class LexEntry:
+class LexEntry(_FrozenSlots):
+    __slots__ = ("tokens", "canonical", "role", "surface")
     tokens: Tuple[str, ...]   # alias tokens (lowercased)
     canonical: str            # canonical key (e.g., "select", "count", "greater_than", "AND")
     role: str                 # e.g., "select_verb", "sql_action", "clause_action", "comparator", "connector"
@@ -20,7 +34,8 @@ class LexEntry:
 
 
 @dataclass(frozen=True)
-class MatchSpan:
+class MatchSpan(_FrozenSlots):
+    __slots__ = ("start", "end", "canonical", "role", "surface")
     start: int               # inclusive start index in tokenized NL
     end: int                 # exclusive end index
     canonical: str           # canonical symbol matched (e.g., "select", "count", "AND")
@@ -144,7 +159,7 @@ def _parse_single_predicate(
 # Basic NLP utilities (public API)
 # --------------------------------------------------------------------------------------
 
-_TOKEN_SPLIT_RE = re.compile(r"[^\w']+")  # split on non-word except apostrophes
+_TOKEN_RE = re.compile(r",|[\w']+")  # commas, or runs of word chars/apostrophes
 
 def tokenize(text: str) -> List[str]:
     """
@@ -155,19 +170,11 @@ def tokenize(text: str) -> List[str]:
     """
     if not text:
         return []
-    # Preserve commas explicitly, split others
-    text = text.replace(",", " , ")
-    parts = []
-    for chunk in text.split():
-        if chunk == ",":
-            parts.append(",")
-            continue
-        # split further on non-word (except ')
-        subs = [s for s in _TOKEN_SPLIT_RE.split(chunk) if s]
-        if not subs:
-            continue
-        parts.extend(subs)
-    return [p.lower() for p in parts if p]
+    if text.isascii():
+        # Lowering first is safe for ASCII; some non-ASCII capitals (e.g. U+0130) lower to
+        # combining sequences that would split differently, so those lower per token.
+        return _TOKEN_RE.findall(text.lower())
+    return [t.lower() for t in _TOKEN_RE.findall(text)]
 
 
 _NUM_RE = re.compile(r"^[+-]?\d+(\.\d+)?$")
@@ -224,7 +231,7 @@ def _normalize_aliases(aliases: Iterable[Any]) -> List[str]:
     return uniq
 
 def _alias_tokens(phrase: str) -> Tuple[str, ...]:
-    return tuple(tokenize(_norm_str(phrase)))
+    return tuple(map(sys.intern, tokenize(_norm_str(phrase))))
 
 def _is_clause_action(name: str, meta: Dict[str, Any]) -> bool:
     placement = (meta or {}).get("placement") or ""
@@ -267,7 +274,8 @@ def build_lexicon_and_connectors(vocabulary: Dict[str, Any]):
     provided = (kw.get("connectors") or kw.get("CONNECTORS") or {})
     if isinstance(provided, dict):
         for k, v in provided.items():
-            connectors_map[str(k).upper()] = _norm_str(v) or connectors_map.get(str(k).upper(), "")
+            name = sys.intern(str(k).upper())
+            connectors_map[name] = sys.intern(_norm_str(v) or connectors_map.get(name, ""))
 
     lex: List[LexEntry] = []
 
@@ -280,8 +288,9 @@ def build_lexicon_and_connectors(vocabulary: Dict[str, Any]):
     # Comparison operators
     for can, meta in (kw.get("comparison_operators") or {}).items():
         aliases = _normalize_aliases((meta or {}).get("aliases") or [])
+        can = sys.intern(str(can))
         for a in aliases:
-            lex.append(LexEntry(tokens=_alias_tokens(a), canonical=str(can), role="comparator", surface=a))
+            lex.append(LexEntry(tokens=_alias_tokens(a), canonical=can, role="comparator", surface=a))
 
     # Actions (top-level, merged with legacy)
     actions = _collect_actions(vocabulary)
@@ -290,8 +299,9 @@ def build_lexicon_and_connectors(vocabulary: Dict[str, Any]):
         role = "clause_action" if _is_clause_action(name, meta or {}) else "sql_action"
         if not aliases:
             aliases = [name]
+        name = sys.intern(str(name))
         for a in aliases:
-            lex.append(LexEntry(tokens=_alias_tokens(a), canonical=str(name), role=role, surface=a))
+            lex.append(LexEntry(tokens=_alias_tokens(a), canonical=name, role=role, surface=a))
 
     # Connectors as lexicon entries (to match like other tokens)
     for cname, surf in connectors_map.items():
@@ -417,23 +427,30 @@ def gather_tables_columns(binder_artifact: Dict[str, Any]):
 # N-gram index & greedy matcher (public API)
 # --------------------------------------------------------------------------------------
 
+_TRIE_END = None  # key under which a trie node stores the LexEntry that ends there
+
 def build_index(lexicon: List[LexEntry]):
     """
-    Build an index keyed by n-gram length for greedy matching.
-    Returns (by_len, max_len) where by_len[length] -> list[LexEntry].
+    Build a token trie for greedy matching.
+    Returns (trie, max_len): nested {token: node} dicts where node[_TRIE_END] holds the
+    LexEntry whose tokens end at that node, and max_len is the longest alias in tokens.
+    When several entries share a token tuple, the first one in the lexicon wins.
     """
-    by_len: Dict[int, List[LexEntry]] = {}
+    trie: Dict[Any, Any] = {}
     max_len = 1
     for le in lexicon:
         L = len(le.tokens)
         if L <= 0:
             continue
-        by_len.setdefault(L, []).append(le)
+        node = trie
+        for tok in le.tokens:
+            node = node.setdefault(tok, {})
+        node.setdefault(_TRIE_END, le)
         if L > max_len:
             max_len = L
-    return by_len, max_len
+    return trie, max_len
 
-def match_aliases(tokens: List[str], by_len: Dict[int, List[LexEntry]], max_len: int) -> List[MatchSpan]:
+def match_aliases(tokens: List[str], trie: Dict[Any, Any], max_len: int) -> List[MatchSpan]:
     """
     Greedy, left-to-right longest-match for n-gram aliases.
     Non-overlapping by construction.
@@ -442,21 +459,20 @@ def match_aliases(tokens: List[str], by_len: Dict[int, List[LexEntry]], max_len:
     i = 0
     N = len(tokens)
     while i < N:
-        matched = False
-        # try longest first
-        for L in range(min(max_len, N - i), 0, -1):
-            window = tuple(tokens[i:i+L])
-            entries = by_len.get(L, [])
-            # exact token tuple match
-            for le in entries:
-                if window == le.tokens:
-                    spans.append(MatchSpan(start=i, end=i+L, canonical=le.canonical, role=le.role, surface=" ".join(le.tokens)))
-                    i += L
-                    matched = True
-                    break
-            if matched:
+        # walk the trie from tokens[i], remembering the deepest node that ends an alias
+        best, best_len = None, 0
+        node = trie
+        for L in range(1, min(max_len, N - i) + 1):
+            node = node.get(tokens[i + L - 1])
+            if node is None:
                 break
-        if not matched:
+            le = node.get(_TRIE_END)
+            if le is not None:
+                best, best_len = le, L
+        if best is not None:
+            spans.append(MatchSpan(start=i, end=i+best_len, canonical=best.canonical, role=best.role, surface=" ".join(best.tokens)))
+            i += best_len
+        else:
             i += 1
     return spans
 
@@ -220,38 +220,25 @@ _COLUMN_NAME_HINTS: Tuple[str, ...] = (
     "column", "geom", "point", "geom1", "geom2", "geom_collection"
 )
 
-def _infer_placeholder_roles(
-    action_meta: Dict[str, Any],
-    placeholders: List[str]
-) -> Tuple[Set[str], Set[str]]:
+def _infer_placeholder_roles(placeholders: List[str]) -> Tuple[Set[str], Set[str]]:
     """
-    Decide which placeholders are column-like vs value-like.
+    Decide which placeholders are column-like vs value-like, by name alone.
 
     Heuristics:
-      - Any name starting with 'value' or equal to 'values' is value-like.
+      - Any name starting with 'value' (including 'values') is value-like.
       - Any name starting with one of _COLUMN_NAME_HINTS is column-like.
-      - If a placeholder name appears in applicable_types, prefer:
-          * column-like if its name starts with a column hint,
-          * otherwise leave it as "other" (must be provided via extra_args).
+      - Anything else is left as "other" (must be provided via extra_args).
       - This covers PostGIS shapes: {geom}, {geom1}, {geom2}, and multi-column actions like {column1}, {column2}.
     """
     col_like: Set[str] = set()
     val_like: Set[str] = set()
 
-    app = (action_meta or {}).get("applicable_types") or {}
-
     for ph in placeholders:
         lname = ph.lower()
-        if lname.startswith("value") or lname == "values":
+        if lname.startswith("value"):
             val_like.add(ph)
-            continue
-        if any(lname.startswith(h) for h in _COLUMN_NAME_HINTS):
+        elif lname.startswith(_COLUMN_NAME_HINTS):
             col_like.add(ph)
-            continue
-        # Fall back to binder knowledge: if arg exists there and looks like a columnish key, treat as column
-        if ph in app and any(ph.lower().startswith(h) for h in _COLUMN_NAME_HINTS):
-            col_like.add(ph)
-            continue
         # else: leave for extra_args (e.g., {to_type}, {part}, {condition})
     return col_like, val_like
 
@@ -373,7 +360,7 @@ def build_select_sql_from_slots(
         req = _placeholders(tmpl)
 
         # Figure out which placeholders are column-like vs value-like
-        col_phs, val_phs = _infer_placeholder_roles(meta, req)
+        col_phs, val_phs = _infer_placeholder_roles(req)
 
         rendered = _render_action(
             action_name=act,
@@ -451,8 +438,10 @@ def execute_sqlite(
     """
     Execute SQL against SQLite and return a JSON-safe result dict:
       { "columns": [...], "rows": [ {col:val,...}, ... ], "rowcount": N }
+    db_path may be a SQLite URI ("file:name?mode=memory&cache=shared"), e.g. for
+    throwaway in-memory databases that never touch the filesystem.
     """
-    conn = sqlite3.connect(db_path)
+    conn = sqlite3.connect(db_path, uri=str(db_path).startswith("file:"))
     conn.row_factory = sqlite3.Row
     try:
         cur = conn.execute(sql)
@@ -5,6 +5,7 @@ from pathlib import Path
 import yaml, argparse, sys, json
 
 from .surfaces_spec_builder import enumerate_specs, SQLSpec, column_slot_types
+from .artifact_helpers import load_artifacts
 
 # =========================
 # Config & result bundle
@@ -125,7 +126,7 @@ def generate_surfaces(
             candidates.append((spec, nl))
 
     # Resolve & classify with runtime
-    from vbg_tools.graph_runtime import map_text
+    from vbg_tools.graph_runtime import map_text, build_vocab_index, build_schema_indices
     try:
         from vbg_tools.sql_helpers import build_sql
     except Exception:
@@ -135,8 +136,11 @@ def generate_surfaces(
     multipath: List[Dict[str, Any]] = []
     invalid: List[Dict[str, Any]] = []
 
+    vocab_index = build_vocab_index(vocab)
+    schema_index = build_schema_indices(binder)
     for spec, nl in candidates:
-        rr = map_text(nl, vocab, binder, grammar_text, want_tree=False)
+        rr = map_text(nl, vocab, binder, grammar_text, want_tree=False,
+                      vocab_index=vocab_index, schema_index=schema_index)
         if not getattr(rr, "parse_ok", False):
             invalid.append({"natural_language": nl, "original_sql": spec.expression_sql, "sql_expressions": []})
             continue
@@ -200,11 +204,7 @@ def write_surfaces(bundle: SurfacesBundle, out_dir: Path) -> None:
 # =========================
 
 def _load_artifacts(vp: Path, bp: Path, gp: Path):
-    return (
-        yaml.safe_load(vp.read_text(encoding="utf-8")),
-        yaml.safe_load(bp.read_text(encoding="utf-8")),
-        gp.read_text(encoding="utf-8"),
-    )
+    return load_artifacts(vp, bp, gp)
 
 def main(argv=None) -> int:
     parser = argparse.ArgumentParser(description="Generate NL surfaces and optionally cli_test.sh")
@@ -1,35 +1,60 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Dict, Any, Iterable, List, Tuple, Set
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import chain
+import re
+import sys
+from types import MappingProxyType
+from typing import Dict, Any, Iterable, List, Mapping, NamedTuple, Tuple, Set
 import yaml
 
 # =========================
 # Data model
 # =========================
 
-@dataclass(frozen=True)
-class SQLSpec:
+class SQLSpec(NamedTuple):
+    # Tuple-backed: immutable/hashable like a frozen dataclass, but cheaper to
+    # build and smaller per instance when enumerating many specs.
     func: str
     arg_key: str           # usually "column"
     table: str
     column: str            # fully-qualified, e.g. "users.age"
-    expression_sql: str    # baseline SELECT … FROM … (no predicates)
+
+    @property
+    def expression_sql(self) -> str:
+        """Baseline SELECT … FROM … (no predicates), built on demand."""
+        return _baseline_sql(self.func, self.table, self.column)
 
 # =========================
 # Type mapping & normalization
 # =========================
 
-_EXPECTED_SLOT_TYPES = {
+# Canonical slot-type strings, interned once so set/dict probes on the hot
+# enumeration path resolve by identity.
+_T_NUMERIC, _T_DATE, _T_TEXT, _T_BOOLEAN, _T_GEOMETRY, _T_ID = map(
+    sys.intern, ("numeric", "date", "text", "boolean", "geometry", "id")
+)
+
+_EXPECTED_SLOT_TYPES = frozenset(map(sys.intern, (
     "numeric", "date", "text", "boolean", "geometry", "geography",
     "geometry_point", "geography_point", "geometry_linestring",
     "geography_linestring", "geometry_polygon", "geography_polygon",
     "id"
-}
+)))
+
+# Hint buckets in precedence order; the first bucket with any substring hit wins.
+# Plain containment checks, since hints can overlap (e.g. "jsonumber", "uuidecimal").
+_DBTYPE_HINTS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    (_T_NUMERIC, ("int", "integer", "bigint", "smallint", "decimal", "numeric", "float", "double", "real")),
+    (_T_DATE, ("date", "timestamp", "timestamptz", "time", "datetime")),
+    (_T_BOOLEAN, ("bool",)),
+    (_T_GEOMETRY, ("geom", "geog")),
+)
+
 
-_NUMERIC_HINTS = {
-    "int", "integer", "bigint", "smallint", "decimal", "numeric", "float", "double", "real"
-}
-_DATE_HINTS = {"date", "timestamp", "timestamptz", "time", "datetime"}
+# Type modifiers such as "(10, 2)" or "(Point, 4326)" say nothing about the slot type
+# and can hold misleading hints ("point" contains "int").
+_TYPE_ARGS_RE = re.compile(r"\([^)]*\)")
 
 
 def dbtype_to_slot_types(db_type: str) -> Set[str]:
@@ -38,7 +63,8 @@ def dbtype_to_slot_types(db_type: str) -> Set[str]:
     If the string parses as a dict with a 'type' key, use that inner 'type'.
     """
     s = db_type or ""
-    if isinstance(s, str) and ("{" in s and "}" in s):
+    # Stringified dicts always open with "{"; a prefix check avoids two full scans
+    if isinstance(s, str) and s.lstrip().startswith("{"):
         try:
             parsed = yaml.safe_load(s)
             if isinstance(parsed, dict) and "type" in parsed:
@@ -47,17 +73,48 @@ def dbtype_to_slot_types(db_type: str) -> Set[str]:
             # keep original s
             pass
     low = s.lower()
-    if any(h in low for h in _NUMERIC_HINTS):
-        return {"numeric"}
-    if any(h in low for h in _DATE_HINTS):
-        return {"date"}
-    if "bool" in low:
-        return {"boolean"}
-    if "geom" in low or "geog" in low:
-        return {"geometry"}
+    if "(" in low:
+        low = " ".join(_TYPE_ARGS_RE.sub(" ", low).split())
+    bucket = _FIRST_CHAR_DISPATCH.get(low[:1])
+    if bucket is not None:
+        hit = bucket.get(low)
+        if hit is not None:
+            return {hit}
+    return _scan_dbtype(low)
+
+
+def _scan_dbtype(low: str) -> Set[str]:
+    """Full hint scan for a lowercased DB type string."""
+    for slot, hints in _DBTYPE_HINTS:
+        if any(h in low for h in hints):
+            return {slot}
     if low == "id" or low.endswith("_id"):
-        return {"id"}
-    return {"text"}
+        return {_T_ID}
+    return {_T_TEXT}
+
+
+# Common DB type names, bucketed by first character so the usual lookup is one
+# dict probe per level. Results come from _scan_dbtype itself, so anything not
+# listed here (or spelled differently) still gets the full scan.
+_COMMON_DBTYPES = (
+    "int", "integer", "bigint", "smallint", "tinyint", "int2", "int4", "int8",
+    "decimal", "numeric", "float", "float4", "float8", "double", "double precision",
+    "real", "money", "number",
+    "date", "time", "timestamp", "timestamptz", "datetime",
+    "bool", "boolean",
+    "geometry", "geography",
+    "text", "char", "varchar", "character varying", "string", "json", "jsonb", "uuid",
+    "id",
+)
+_FIRST_CHAR_DISPATCH: Dict[str, Dict[str, str]] = {}
+for _name in _COMMON_DBTYPES:
+    (_slot,) = _scan_dbtype(_name)
+    _FIRST_CHAR_DISPATCH.setdefault(_name[0], {})[_name] = _slot
+del _name, _slot
+
+
+def _only_strs(xs: Iterable[Any]) -> Iterable[str]:
+    return (x for x in xs if isinstance(x, str))
 
 
 def _normalize_slot_types(st_raw: Any, db_type: str) -> Set[str]:
@@ -72,10 +129,13 @@ def _normalize_slot_types(st_raw: Any, db_type: str) -> Set[str]:
 
     # Single string?
     if isinstance(st_raw, str):
+        # Common case: already a canonical lowercase slot type
+        if st_raw in _EXPECTED_SLOT_TYPES:
+            return {st_raw}
         s = st_raw.strip()
         low = s.lower()
         if low in _EXPECTED_SLOT_TYPES:
-            return {low}
+            return {sys.intern(low)}
         # try to parse as yaml/json
         try:
             parsed = yaml.safe_load(s)
@@ -86,16 +146,14 @@ def _normalize_slot_types(st_raw: Any, db_type: str) -> Set[str]:
             types = dbtype_to_slot_types(inner_t)
             return types if types else dbtype_to_slot_types(db_type)
         if isinstance(parsed, list):
-            cleaned = {str(x).lower() for x in parsed if isinstance(x, str)}
-            cleaned &= _EXPECTED_SLOT_TYPES
-            return cleaned if cleaned else dbtype_to_slot_types(db_type)
+            cleaned = _EXPECTED_SLOT_TYPES.intersection(map(str.lower, _only_strs(parsed)))
+            return set(map(sys.intern, cleaned)) if cleaned else dbtype_to_slot_types(db_type)
         return dbtype_to_slot_types(db_type)
 
     # List?
     if isinstance(st_raw, list):
-        cleaned = {str(x).lower() for x in st_raw if isinstance(x, str)}
-        cleaned &= _EXPECTED_SLOT_TYPES
-        return cleaned if cleaned else dbtype_to_slot_types(db_type)
+        cleaned = _EXPECTED_SLOT_TYPES.intersection(map(str.lower, _only_strs(st_raw)))
+        return set(map(sys.intern, cleaned)) if cleaned else dbtype_to_slot_types(db_type)
 
     # Fallback
     return dbtype_to_slot_types(db_type)
@@ -127,16 +185,44 @@ def column_slot_types(binder: Dict[str, Any], fqcol: str) -> Set[str]:
 # Helpers to walk binder & vocab
 # =========================
 
-def _iter_table_columns(binder: Dict[str, Any]) -> Iterable[Tuple[str, str]]:
-    """Yield (table, fqcol) for each fully-qualified column present."""
+def _iter_table_columns(binder: Dict[str, Any]) -> Iterable[Tuple[str, str, Dict[str, Any]]]:
+    """Yield (table, fqcol, meta) for each well-formed fully-qualified column present."""
     cats = binder.get("catalogs") or {}
     cols = cats.get("columns") or {}
     for fq, meta in cols.items():
-        table = (meta or {}).get("table")
-        name = (meta or {}).get("name")
-        if not table or not name:
+        if not isinstance(meta, dict):
             continue
-        yield table, fq
+        table = meta.get("table")
+        if table and meta.get("name"):
+            yield table, fq, meta
+
+
+@dataclass(frozen=True)
+class BinderIndex:
+    """
+    Column metadata resolved once per binder, shareable across spec batches.
+      - columns:             (table, fqcol) in binder order (well-formed entries only)
+      - slot_types_by_fqcol: fqcol -> normalized slot types (read-only)
+    The index is a snapshot of `binder`; rebuild it after editing the binder.
+    """
+    columns: Tuple[Tuple[str, str], ...]
+    slot_types_by_fqcol: Mapping[str, frozenset]
+    binder: Dict[str, Any] = field(compare=False, repr=False)
+
+
+def build_binder_index(binder: Dict[str, Any]) -> BinderIndex:
+    """Walk binder.catalogs.columns once and normalize everything enumerate_specs needs."""
+    columns: List[Tuple[str, str]] = []
+    slot_types: Dict[str, frozenset] = {}
+    for table, fq, meta in _iter_table_columns(binder):
+        slot_types[fq] = frozenset(_normalize_slot_types(meta.get("slot_types"), meta.get("type", "")))
+        columns.append((table, fq))
+
+    return BinderIndex(
+        columns=tuple(columns),
+        slot_types_by_fqcol=MappingProxyType(slot_types),
+        binder=binder,
+    )
 
 
 def _projection_actions_from_vocab(vocab: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
@@ -165,24 +251,34 @@ def _required_types(vmeta: Dict[str, Any], arg_key: str) -> List[str]:
     return []
 
 
-def _applicable(col_slots: Set[str], required: List[str]) -> bool:
-    if not required:
-        # strict: no applicable_types -> not applicable
-        return False
-    if "any" in {r.lower() for r in required}:
-        return True
-    return any(r in col_slots for r in required)
+def _requirement(vmeta: Dict[str, Any], arg_key: str) -> Tuple[frozenset, bool]:
+    """
+    (lowercased required types, accepts-any) for one action argument, derived from
+    applicable_types once per action so the column loop only does set probes.
+    """
+    req_set = frozenset(str(r).lower() for r in _required_types(vmeta, arg_key))
+    return req_set, "any" in req_set
 
 
+_DQ_ESCAPE = str.maketrans({'"': '""'})
+
+
+@lru_cache(maxsize=2048)
 def _qi(s: str) -> str:
-    return '"' + s.replace('"', '""') + '"'
+    # Table/column names repeat across every spec for a column, hence the cache.
+    # Identifiers rarely contain quotes; skip the escaping pass when they don't.
+    if '"' not in s:
+        return f'"{s}"'
+    return f'"{s.translate(_DQ_ESCAPE)}"'
 
 
 def _baseline_sql(func: str, table: str, fqcol: str) -> str:
     tbl, col = fqcol.split(".", 1)
+    qcol = f"{_qi(tbl)}.{_qi(col)}"
+    qtable = _qi(table)
     if func.lower() == "distinct":
-        return f'SELECT DISTINCT {_qi(tbl)}.{_qi(col)} FROM {_qi(table)}'
-    return f'SELECT {func.upper()}({_qi(tbl)}.{_qi(col)}) FROM {_qi(table)}'
+        return f"SELECT DISTINCT {qcol} FROM {qtable}"
+    return f"SELECT {func.upper()}({qcol}) FROM {qtable}"
 
 
 # =========================
@@ -195,37 +291,49 @@ def enumerate_specs(
     *,
     arg_key: str = "column",
     max_specs: int = 1000,
+    index: BinderIndex | None = None,
 ) -> List[SQLSpec]:
     """
     Map (binder × vocab) -> list of SQLSpec, only when 'applicable_types' agrees with the column's slot types.
     Numeric/date columns are enumerated first to bias toward constraints downstream.
+    Pass a prebuilt `index` (see build_binder_index) to share column metadata across calls;
+    it must have been built from this same `binder`.
     """
     actions = _projection_actions_from_vocab(vocab)
-    cols = list(_iter_table_columns(binder))
-
-    def _prio(item: Tuple[str, str]) -> int:
-        _, fq = item
-        st = column_slot_types(binder, fq)
-        if "numeric" in st: return 0
-        if "date" in st:    return 1
-        return 2
-
-    cols.sort(key=_prio)
+    if index is None:
+        index = build_binder_index(binder)
+    elif index.binder is not binder:
+        raise ValueError("enumerate_specs: index was built from a different binder")
+    slot_types_by_fqcol = index.slot_types_by_fqcol
+
+    # Stable three-way partition (numeric, date, rest) in one pass; carries the
+    # slot types forward so they are looked up once per column.
+    numeric_cols: List[Tuple[str, str, frozenset]] = []
+    date_cols: List[Tuple[str, str, frozenset]] = []
+    other_cols: List[Tuple[str, str, frozenset]] = []
+    for table, fqcol in index.columns:
+        st = slot_types_by_fqcol[fqcol]
+        if _T_NUMERIC in st:
+            numeric_cols.append((table, fqcol, st))
+        elif _T_DATE in st:
+            date_cols.append((table, fqcol, st))
+        else:
+            other_cols.append((table, fqcol, st))
+
+    # Resolve each action's requirements once, outside the column loop.
+    # Strict: actions without applicable_types for arg_key are never applicable.
+    action_table: List[Tuple[str, frozenset, bool]] = []
+    for func, meta in actions.items():
+        req_set, has_any = _requirement(meta, arg_key)
+        if req_set:
+            action_table.append((func, req_set, has_any))
 
     out: List[SQLSpec] = []
-    for table, fqcol in cols:
-        slots = column_slot_types(binder, fqcol)
-        for func, meta in actions.items():
-            req = _required_types(meta, arg_key)
-            if not _applicable(slots, req):
+    for table, fqcol, slots in chain(numeric_cols, date_cols, other_cols):
+        for func, req_set, has_any in action_table:
+            if not has_any and slots.isdisjoint(req_set):
                 continue
-            out.append(SQLSpec(
-                func=func,
-                arg_key=arg_key,
-                table=table,
-                column=fqcol,
-                expression_sql=_baseline_sql(func, table, fqcol),
-            ))
+            out.append(SQLSpec(func, arg_key, table, fqcol))
             if len(out) >= max_specs:
                 return out
     return out
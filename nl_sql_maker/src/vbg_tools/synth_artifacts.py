@@ -1,7 +1,7 @@
 # vbg_tools/synth_artifacts.py
 from __future__ import annotations
 
-from typing import Any, Dict, List, Set
+from typing import Any, Dict, List, Set, Tuple
 
 from .artifact_helpers import (
     extract_keywords_root,
@@ -12,6 +12,7 @@ from .artifact_helpers import (
     collect_column_rows,
     collect_functions_from_schema,
     ensure_core_connectors,
+    CORE_CONNECTORS,
 )
 
 
@@ -34,7 +35,12 @@ def _collect_comparators(kw: dict) -> dict:
 
 
 def _collect_filler_words(kw: dict) -> dict:
-    aliases = (((kw.get("filler_words") or {}).get("_skip") or {}).get("aliases")) or []
+    fw = kw.get("filler_words")
+    aliases = ()
+    if isinstance(fw, dict):
+        skip = fw.get("_skip")
+        if isinstance(skip, dict):
+            aliases = skip.get("aliases") or ()
     return {"_skip": {"aliases": normalize_aliases(aliases)}}
 
 
@@ -59,25 +65,20 @@ def _normalize_action_entry(name: str, meta: dict) -> dict:
         bind_style = "of" if ("{column}" in template or "{value}" in template or "{" in template) else "to"
 
     applicable_types = meta.get("applicable_types") or {}
-    # Normalize applicable_types → map[str] -> list[str]
+    # Normalize applicable_types → map[str] -> list[str], flattening to reqs in the same pass
     app_norm: dict[str, List[str]] = {}
+    reqs: List[dict] = []
     for arg, types in applicable_types.items():
+        sarg = str(arg)
         if isinstance(types, list):
-            app_norm[str(arg)] = [str(t) for t in types if str(t).strip()]
+            tlist = [s for t in types if (s := str(t)).strip()]
         elif types is None:
-            app_norm[str(arg)] = []
+            tlist = []
         else:
-            app_norm[str(arg)] = [str(types)]
-
-    # Flatten to reqs
-    reqs: List[dict] = []
-    for arg, types in app_norm.items():
-        if types:
-            for st in types:
-                reqs.append({"arg": arg, "st": st})
-        else:
-            # If no explicit slot types, keep a generic 'any' requirement (optional)
-            pass
+            tlist = [str(types)]
+        app_norm[sarg] = tlist
+        # No explicit slot types → no reqs entry
+        reqs.extend({"arg": sarg, "st": st} for st in tlist)
 
     return {
         "template": template,
@@ -102,15 +103,13 @@ def _collect_sql_actions_combined(keywords_yaml: dict) -> dict:
     nested_kw = extract_keywords_root(keywords_yaml)
     legacy = (nested_kw.get("sql_actions") or {}) if isinstance(nested_kw, dict) else {}
 
-    merged_names = set(top.keys()) | set(legacy.keys())
-    out: dict = {}
-    for name in merged_names:
-        # Prefer top-level definition if present
-        src = top.get(name) if name in top else legacy.get(name, {})
-        if not isinstance(src, dict):
-            src = {}
-        out[str(name)] = _normalize_action_entry(str(name), src)
-    return out
+    # Top-level definitions override legacy ones of the same name
+    merged = dict(legacy) if isinstance(legacy, dict) else {}
+    merged.update(top)
+    return {
+        str(name): _normalize_action_entry(str(name), src if isinstance(src, dict) else {})
+        for name, src in merged.items()
+    }
 
 
 def build_vocabulary(keywords_yaml: dict) -> dict:
@@ -143,6 +142,11 @@ def build_vocabulary(keywords_yaml: dict) -> dict:
 # Binder synthesis
 # =========================
 
+def _arity(reqs: List[dict]) -> int:
+    """Number of distinct arg names across a requirements list."""
+    return len({r.get("arg") or "" for r in reqs})
+
+
 def _functions_from_actions(sql_actions: dict) -> dict:
     """
     Derive function signatures directly from sql_actions (arity = number of unique arg names in 'reqs').
@@ -151,9 +155,8 @@ def _functions_from_actions(sql_actions: dict) -> dict:
     out = {}
     for name, meta in (sql_actions or {}).items():
         reqs = meta.get("reqs") or []
-        arity = len({(r.get("arg") or "") for r in reqs})
         out[name] = {
-            "arity": arity,
+            "arity": _arity(reqs),
             "template": meta.get("template", ""),
             "requirements": reqs,
             "placement": meta.get("placement", "projection"),
@@ -162,27 +165,28 @@ def _functions_from_actions(sql_actions: dict) -> dict:
     return out
 
 
-def _ensure_ordering_functions(functions: dict) -> dict:
-    has_desc = any(n in functions for n in ("order_by_desc", "orderby_desc"))
-    has_asc = any(n in functions for n in ("order_by", "orderby"))
-
-    if not has_desc:
-        functions["order_by_desc"] = {
-            "arity": 1,
-            "template": "{column}",
-            "requirements": [{"arg": "column", "st": "any"}],
-            "placement": "clause",
-            "bind_style": "of",
-        }
+# Shape shared by the synthesized order_by / order_by_desc clause functions
+_ORDER_TEMPLATE = {
+    "arity": 1,
+    "template": "{column}",
+    "requirements": ({"arg": "column", "st": "any"},),
+    "placement": "clause",
+    "bind_style": "of",
+}
 
-    if not has_asc:
-        functions["order_by"] = {
-            "arity": 1,
-            "template": "{column}",
-            "requirements": [{"arg": "column", "st": "any"}],
-            "placement": "clause",
-            "bind_style": "of",
-        }
+
+def _order_function() -> dict:
+    # Fresh containers per entry: shared objects would be dumped as YAML anchors
+    fn = dict(_ORDER_TEMPLATE)
+    fn["requirements"] = [dict(r) for r in _ORDER_TEMPLATE["requirements"]]
+    return fn
+
+
+def _ensure_ordering_functions(functions: dict) -> dict:
+    if "order_by_desc" not in functions and "orderby_desc" not in functions:
+        functions["order_by_desc"] = _order_function()
+    if "order_by" not in functions and "orderby" not in functions:
+        functions["order_by"] = _order_function()
     return functions
 
 
@@ -196,6 +200,32 @@ def _normalize_db_type_str(t: str | None) -> str | None:
     return s
 
 
+# Slot buckets in precedence order; the first bucket with any substring hit wins
+# (containment checks, since hints can overlap, e.g. "jsonumber"). "date" only counts
+# as an exact match. DB types spelled "...point..." / "...line_string..." always contain
+# "int" / "string", so they resolve to numeric / text; only the abstract
+# geometry_point / geometry_linestring names (handled by callers) map to those.
+_DB_TYPE_HINTS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("numeric", ("int", "decimal", "numeric", "real", "double", "money", "number")),
+    ("text", ("char", "text", "varchar", "string", "uuid", "json")),
+    ("boolean", ("bool",)),
+    ("timestamp", ("timestamp", "datetime")),
+    ("geometry_polygon", ("polygon",)),
+    ("geometry", ("geometry",)),
+    ("geography", ("geography",)),
+)
+
+
+def _db_type_to_slot_type(lo: str) -> str | None:
+    """Map a lowercased DB type (e.g. 'varchar(50)') to one abstract slot type, or None."""
+    if lo == "date":  # contains none of the higher-precedence hints
+        return "date"
+    for slot, hints in _DB_TYPE_HINTS:
+        if any(h in lo for h in hints):
+            return slot
+    return None
+
+
 def _slot_types_from_types_list(types: list[str]) -> list[str]:
     """
     Convert a list that may contain DB types (INTEGER, VARCHAR(50), DECIMAL...)
@@ -226,34 +256,48 @@ def _slot_types_from_types_list(types: list[str]) -> list[str]:
                 out.add(lo)
             continue
 
-        # DB → abstract mapping
-        if any(k in lo for k in ("int", "decimal", "numeric", "real", "double", "money", "number")):
-            out.add("numeric")
-        elif any(k in lo for k in ("char", "text", "varchar", "string", "uuid", "json")):
-            out.add("text")
-        elif "bool" in lo:
-            out.add("boolean")
-        elif lo == "date":
-            out.add("date")
-        elif "timestamp" in lo or "datetime" in lo:
-            out.add("timestamp")
-        elif "polygon" in lo:
-            out.add("geometry_polygon")
-        elif "linestring" in lo or "line_string" in lo:
-            out.add("geometry_linestring")
-        elif "point" in lo:
-            out.add("geometry_point")
-        elif "geometry" in lo:
-            out.add("geometry")
-        elif "geography" in lo:
-            out.add("geography")
-        else:
-            # Unknown → don't invent; leave it out
-            pass
+        # DB → abstract mapping (unknown → don't invent; leave it out)
+        st = _db_type_to_slot_type(lo)
+        if st:
+            out.add(st)
 
     return sorted(out)
 
 
+def _first_clean_db_type(raw_types: List[str]) -> str | None:
+    for t in raw_types:
+        tnorm = _normalize_db_type_str(t)
+        if tnorm:
+            return tnorm
+    return None
+
+
+def _binder_column(r: Dict[str, Any]) -> Dict[str, Any]:
+    """Binder column entry from a collect_column_rows row (fqn guaranteed "table.col")."""
+    raw_types: List[str] = r.get("types") or []
+    return {
+        "name": r.get("name") or r["fqn"].split(".", 1)[-1],
+        "table": r["table"],
+        "type": _first_clean_db_type(raw_types),
+        "slot_types": _slot_types_from_types_list(raw_types),
+    }
+
+
+def _vocab_connectors(vocabulary: dict) -> dict:
+    """
+    Connectors from build_vocabulary are already normalized by ensure_core_connectors;
+    only re-normalize when the core set is missing or keys/values are not canonical.
+    """
+    conn = (vocabulary.get("keywords") or {}).get("connectors") or {}
+    if (
+        isinstance(conn, dict)
+        and CORE_CONNECTORS.keys() <= conn.keys()
+        and all(isinstance(k, str) and k.strip() and k == k.upper() and isinstance(v, str) for k, v in conn.items())
+    ):
+        return conn
+    return ensure_core_connectors(conn)
+
+
 def build_binder(schema_yaml: dict, vocabulary: dict) -> dict:
     """
     Build binder with normalized tables/columns/functions/connectors.
@@ -267,80 +311,9 @@ def build_binder(schema_yaml: dict, vocabulary: dict) -> dict:
     column_rows = collect_column_rows(schema_yaml)  # now returns clean fqn/table/name/types
 
     tables = {r["n"]: {} for r in table_rows}
-    columns: Dict[str, Dict[str, Any]] = {}
-
-    def _normalize_db_type_str(t: str | None) -> str | None:
-        if not t:
-            return None
-        s = str(t).strip()
-        return None if (s.startswith("{") and s.endswith("}")) else s
-
-    def _slot_types_from_list(types: List[str]) -> List[str]:
-        out: set[str] = set()
-        for raw in (types or []):
-            if not raw:
-                continue
-            s = str(raw).strip()
-            if not s or (s.startswith("{") and s.endswith("}")):
-                continue
-            lo = s.lower()
-
-            # Already-abstract
-            if lo in {"any", "numeric", "integer", "float", "boolean", "text", "date", "timestamp",
-                      "geometry", "geography",
-                      "geometry_point", "geometry_linestring", "geometry_polygon",
-                      "geography_point", "geography_linestring", "geography_polygon"}:
-                if lo in {"integer", "float"}:
-                    out.add("numeric")
-                else:
-                    out.add(lo)
-                continue
-
-            # DB → abstract
-            if any(k in lo for k in ("int", "decimal", "numeric", "real", "double", "money", "number")):
-                out.add("numeric")
-            elif any(k in lo for k in ("char", "text", "varchar", "string", "uuid", "json")):
-                out.add("text")
-            elif "bool" in lo:
-                out.add("boolean")
-            elif lo == "date":
-                out.add("date")
-            elif "timestamp" in lo or "datetime" in lo:
-                out.add("timestamp")
-            elif "polygon" in lo:
-                out.add("geometry_polygon")
-            elif "linestring" in lo or "line_string" in lo:
-                out.add("geometry_linestring")
-            elif "point" in lo:
-                out.add("geometry_point")
-            elif "geometry" in lo:
-                out.add("geometry")
-            elif "geography" in lo:
-                out.add("geography")
-        return sorted(out)
-
-    for r in column_rows:
-        fqn = r["fqn"]                             # guaranteed "table.col"
-        table = r["table"]
-        name = r.get("name") or fqn.split(".", 1)[-1]
-        raw_types: List[str] = r.get("types") or []
-
-        # Choose one clean DB type if present
-        db_type: str | None = None
-        for t in raw_types:
-            tnorm = _normalize_db_type_str(t)
-            if tnorm:
-                db_type = tnorm
-                break
-
-        slot_types = _slot_types_from_list(raw_types)
-
-        columns[fqn] = {
-            "name": name,
-            "table": table,
-            "type": db_type,
-            "slot_types": slot_types,
-        }
+    # One comprehension sizes the dict once; the nested helpers that used to live
+    # here duplicated the module-level _normalize_db_type_str/_slot_types_from_types_list.
+    columns: Dict[str, Dict[str, Any]] = {r["fqn"]: _binder_column(r) for r in column_rows}
 
     # functions
     schema_fns = collect_functions_from_schema(schema_yaml)
@@ -348,7 +321,7 @@ def build_binder(schema_yaml: dict, vocabulary: dict) -> dict:
         functions: Dict[str, Any] = {}
         for r in schema_fns:
             name = r["name"]
-            arity = len({(x.get("arg") or "") for x in (r.get("reqs") or [])})
+            arity = _arity(r.get("reqs") or [])
             functions[name] = {
                 "arity": arity,
                 "template": r.get("template", ""),
@@ -363,7 +336,8 @@ def build_binder(schema_yaml: dict, vocabulary: dict) -> dict:
 
     functions = _ensure_ordering_functions(functions)
 
-    connectors = ensure_core_connectors(((vocabulary.get("keywords") or {}).get("connectors") or {}))
+    # Copy so the binder never aliases the vocabulary's dict
+    connectors = dict(_vocab_connectors(vocabulary))
 
     return {
         "catalogs": {
@@ -379,23 +353,25 @@ def build_binder(schema_yaml: dict, vocabulary: dict) -> dict:
 # Grammar synthesis
 # =========================
 
+# Lowercase placeholders that must never appear as quoted grammar literals
+_BANNED_LITERALS = frozenset({"table", "columns", "value"})
+
+
 def _emit_terminal_lines(connectors: dict) -> list[str]:
     """
     Emit case-insensitive terminals for words; COMMA uses ','.
     Avoid ever quoting the lowercase placeholders 'table', 'columns', 'value'.
     """
-    lines = []
-    seen = set()
+    lines: list[str] = []
+    seen: set[str] = set()
+    lines_append = lines.append
+    seen_add = seen.add
 
     def add(name: str, literal: str):
-        nonlocal lines, seen
         if name in seen:
             return
-        if literal.isalpha():
-            lines.append(f'{name}: "{literal}"i')
-        else:
-            lines.append(f'{name}: "{literal}"')
-        seen.add(name)
+        lines_append(f'{name}: "{literal}"i' if literal.isalpha() else f'{name}: "{literal}"')
+        seen_add(name)
 
     add("SELECT", "select")
 
@@ -405,7 +381,7 @@ def _emit_terminal_lines(connectors: dict) -> list[str]:
         lit = str(v)
         if name == "SELECT":
             continue
-        if lit.lower() in ("table", "columns", "value"):
+        if lit.lower() in _BANNED_LITERALS:
             continue
         add(name, lit)
 
@@ -420,25 +396,24 @@ def _emit_terminal_lines(connectors: dict) -> list[str]:
 def _collect_action_names(vocabulary: dict, binder: dict) -> set[str]:
     # Prefer actions from vocabulary (keywords.sql_actions)
     kw = (vocabulary.get("keywords") or {})
-    names: set[str] = set((kw.get("sql_actions") or {}).keys())
+    source = kw.get("sql_actions") or {}
     # If none, fall back to binder functions
-    if not names:
-        funcs = ((binder.get("catalogs") or {}).get("functions") or {})
-        names.update(funcs.keys())
-    # Never include placeholders
-    return {n for n in names if n.lower() not in {"table", "columns", "value"}}
+    if not source:
+        source = ((binder.get("catalogs") or {}).get("functions") or {})
+    # Never include placeholders; filter straight off the key view, no intermediate copy
+    return {n for n in source if n.lower() not in _BANNED_LITERALS}
 
 
 def _emit_action_rule(names: set[str]) -> str:
     if not names:
         return 'action: "count"i | "avg"i | "sum"i | "min"i | "max"i'
-    alts = " | ".join(f'"{n}"i' for n in sorted(names))
+    # join() materializes its input anyway; hand it a list rather than a generator
+    alts = " | ".join([f'"{n}"i' for n in sorted(names)])
     return f"action: {alts}"
 
 
 def build_grammar(vocabulary: dict, binder: dict) -> str:
-    connectors = (vocabulary.get("keywords") or {}).get("connectors") or {}
-    connectors = ensure_core_connectors(connectors)
+    connectors = _vocab_connectors(vocabulary)
 
     parts: list[str] = []
     parts.append("// Auto-generated Lark grammar (offline synthesis)")
@@ -463,6 +438,7 @@ def build_grammar(vocabulary: dict, binder: dict) -> str:
     parts.append("")
     parts.append("%import common.WS")
     parts.append("%ignore WS")
+    parts.append("")  # trailing newline, without a second full-string copy
 
-    grammar = "\n".join(parts) + "\n"
-    return grammar
+    # A single join sizes the result once; measured faster than StringIO writes here
+    return "\n".join(parts)
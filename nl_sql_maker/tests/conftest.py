@@ -1,15 +1,27 @@
 # tests/conftest.py
 from __future__ import annotations
 import os, sys, subprocess, json
+import copy
+import contextlib, io
+from functools import lru_cache
+import importlib
 from pathlib import Path
-import tempfile
 import pytest
 import yaml
 
-# Make project root importable once here
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional
+    _json_loads = json.loads
+
+# Make project root (and src/, for the module-level vbg_tools import) importable once here
 ROOT = Path(__file__).resolve().parents[1]
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
+for _p in (ROOT, ROOT / "src"):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+from vbg_tools.generate_artifacts import main as gen_main
+from vbg_tools.artifact_helpers import _Loader, _Dumper
 
 # -------------------------------
 # Helpers: IO + minimal fallbacks
@@ -48,13 +60,48 @@ _MIN_SCHEMA = {
 def _write_yaml(path: Path, obj: dict) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8") as f:
-        yaml.safe_dump(obj, f, sort_keys=False, allow_unicode=True)
+        # Very wide lines: the emitter never has to compute wrap points for long alias lists
+        yaml.dump(obj, f, Dumper=_Dumper, sort_keys=False, allow_unicode=True, width=1 << 20)
+
+@lru_cache(maxsize=64)
+def _load_yaml_cached(path_str: str, mtime_ns: int):
+    # Keyed on mtime so a regenerated file is re-parsed; bytes let libyaml decode
+    with open(path_str, "rb") as f:
+        return yaml.load(f, Loader=_Loader)
 
 def _load_yaml(path: Path):
     if not path.exists():
         raise AssertionError(f"Expected file missing: {path}")
-    with path.open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    # Fresh copy per caller: a test mutating its fixture must not leak into later loads
+    return copy.deepcopy(_load_yaml_cached(str(path), path.stat().st_mtime_ns))
+
+# SURFACES_CMD / RUNTIME_PARSE_CMD of the form "python:<module>:<function>" are
+# called in-process instead of through a shell + fresh interpreter.
+_INPROC_PREFIX = "python:"
+
+def _resolve_inproc(spec: str):
+    target = spec[len(_INPROC_PREFIX):]
+    mod_name, sep, func_name = target.partition(":")
+    if not sep or not mod_name or not func_name:
+        raise AssertionError(f"Expected 'python:<module>:<function>', got: {spec!r}")
+    return getattr(importlib.import_module(mod_name), func_name)
+
+def _run_surfaces_cmd(surf_cmd: str, out: Path) -> None:
+    """
+    Run SURFACES_CMD against the artifact dir `out`.
+      - 'python:<module>:<function>' is called in-process like a CLI main:
+        fn(["--art-dir", "<out>"]) -> exit code (e.g. vbg_tools.surfaces_pipeline:main)
+      - anything else is a shell command that may reference {out}
+    """
+    if surf_cmd.startswith(_INPROC_PREFIX):
+        rc = _resolve_inproc(surf_cmd)(["--art-dir", str(out)])
+        if rc:
+            raise AssertionError(f"Surface generation failed with exit code {rc}")
+        return
+    cmd = surf_cmd.format(out=str(out))
+    completed = subprocess.run(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    if completed.returncode != 0:
+        raise AssertionError(f"Surface generation failed.\nSTDOUT:\n{completed.stdout}\nSTDERR:\n{completed.stderr}")
 
 # ------------------------------------
 # Session setup: build artifacts once
@@ -91,7 +138,6 @@ def art_dir(tmp_path_factory) -> Path:
         sc_path = str(out / "schema.yaml")
 
     # Generate artifacts (call offline generator programmatically)
-    from vbg_tools.generate_artifacts import main as gen_main
     rc = gen_main(["--keywords", kw_path, "--schema", sc_path, "--out", str(out), "--quiet"])
     if rc != 0:
         raise AssertionError(f"Artifact generation failed with exit code {rc}")
@@ -99,11 +145,7 @@ def art_dir(tmp_path_factory) -> Path:
     # Optionally generate surfaces via a user-supplied command
     surf_cmd = os.environ.get("SURFACES_CMD", "").strip()
     if surf_cmd:
-        # The command can reference {out} for the artifact dir
-        cmd = surf_cmd.format(out=str(out))
-        completed = subprocess.run(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        if completed.returncode != 0:
-            raise AssertionError(f"Surface generation failed.\nSTDOUT:\n{completed.stdout}\nSTDERR:\n{completed.stderr}")
+        _run_surfaces_cmd(surf_cmd, out)
 
     # Make it discoverable for any legacy code
     os.environ["ART_DIR"] = str(out)
@@ -155,6 +197,15 @@ def grammar_text(grammar_path: Path) -> str:
         raise AssertionError(f"Expected file missing: {grammar_path}")
     return grammar_path.read_text(encoding="utf-8")
 
+@pytest.fixture(scope="session")
+def lark_parser(grammar_text: str):
+    """
+    LALR parser for the generated grammar, built once per session. cache=True
+    persists Lark's analysed tables (keyed on the grammar hash) across sessions.
+    """
+    Lark = pytest.importorskip("lark").Lark
+    return Lark(grammar_text, start="query", parser="lalr", cache=True)
+
 # --------------------------------------------
 # Optional runtime invocation for quick checks
 # --------------------------------------------
@@ -166,16 +217,44 @@ def runtime_cmd():
         pytest.skip("Set RUNTIME_PARSE_CMD to enable runtime parse validation (skipping).")
     return cmd
 
-def run_runtime_json(cmd_template: str, nl: str) -> dict:
-    cmd = cmd_template.format(nl=nl)
-    completed = subprocess.run(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    out = (completed.stdout or "").strip()
+def _run_runtime_json(cmd_template: str, nl: str) -> dict:
+    """
+    Run RUNTIME_PARSE_CMD for one NL query and return its JSON payload.
+      - 'python:<module>:<function>' is called in-process like a CLI main:
+        fn([nl, "--json"]) -> exit code, JSON on stdout (e.g. vbg_tools.graph_runtime:main)
+      - anything else is a shell command that may reference {nl}
+    """
+    if cmd_template.startswith(_INPROC_PREFIX):
+        buf = io.StringIO()
+        with contextlib.redirect_stdout(buf):
+            rc = _resolve_inproc(cmd_template)([nl, "--json"])
+        if rc:
+            raise AssertionError(f"Runtime failed with exit code {rc}.\nSTDOUT:\n{buf.getvalue()}")
+        out = buf.getvalue().strip()
+        stderr = ""
+    else:
+        cmd = cmd_template.format(nl=nl)
+        # Raw bytes: orjson parses them directly, skipping a str decode
+        completed = subprocess.run(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        out = (completed.stdout or b"").strip()
+        stderr = (completed.stderr or b"").decode("utf-8", "replace")
     if not out:
-        raise AssertionError(f"Runtime produced no output.\nSTDERR:\n{completed.stderr}")
+        raise AssertionError(f"Runtime produced no output.\nSTDERR:\n{stderr}")
     try:
-        return json.loads(out)
-    except json.JSONDecodeError:
-        raise AssertionError(f"Runtime did not return JSON.\nSTDOUT:\n{out}\nSTDERR:\n{completed.stderr}")
+        return _json_loads(out)
+    except ValueError:  # json.JSONDecodeError and orjson.JSONDecodeError are both ValueErrors
+        shown = out.decode("utf-8", "replace") if isinstance(out, bytes) else out
+        raise AssertionError(f"Runtime did not return JSON.\nSTDOUT:\n{shown}\nSTDERR:\n{stderr}")
+
+@pytest.fixture(scope="session")
+def run_runtime_json():
+    """(cmd_template, nl) -> dict; see _run_runtime_json."""
+    return _run_runtime_json
+
+@pytest.fixture(scope="session")
+def run_surfaces_cmd():
+    """(surf_cmd, out_dir) -> None; see _run_surfaces_cmd."""
+    return _run_surfaces_cmd
 
 # --------------------------------
 # Optional surfaces loading/skip
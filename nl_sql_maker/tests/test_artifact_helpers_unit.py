@@ -17,6 +17,10 @@ def test_normalize_aliases_dedup_and_strip():
     ali = normalize_aliases(["  foo ", "Foo", "bar", "", "bar "])
     # keep original case, dedup + strip, sorted for determinism
     assert ali == ["Foo", "bar", "foo"]
+    # memoized: callers get an independent list each time
+    ali.append("zzz")
+    assert normalize_aliases(["  foo ", "Foo", "bar", "", "bar "]) == ["Foo", "bar", "foo"]
+    assert normalize_aliases([True]) == ["True"] and normalize_aliases([1]) == ["1"]
 
 
 def test_ensure_core_connectors_adds_defaults_and_upcases_keys():
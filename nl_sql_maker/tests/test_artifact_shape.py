@@ -3,6 +3,10 @@ from __future__ import annotations
 import re
 from pathlib import Path
 
+_DESC_NAMES = frozenset({"order_by_desc", "orderby_desc"})
+_ASC_NAMES  = frozenset({"order_by", "orderby"})
+_BANNED_RE = re.compile(r'"(?:table|columns|value)"')
+
 def test_vocabulary_minimal_contract(vocab):
     # Required sections present
     assert vocab, "Vocabulary YAML is empty."
@@ -18,6 +22,9 @@ def test_vocabulary_minimal_contract(vocab):
     assert sql_actions, "Missing 'sql_actions' in vocabulary."
     some = next(iter(sql_actions.values()))
     assert "aliases" in some, "sql_actions entries must include 'aliases'."
+    # applicable_types is the only stored applicability; nothing derived from it is persisted
+    derived = [n for n, m in sql_actions.items() if {"has_any_arg", "required_by_arg_lower"} & set(m or {})]
+    assert not derived, f"sql_actions carry derived applicability fields: {derived}"
 
 def test_binder_minimal_contract(binder):
     assert binder, "Binder YAML is empty."
@@ -26,18 +33,17 @@ def test_binder_minimal_contract(binder):
         assert key in cats, f"Binder missing catalogs.{key}"
     # Ascending & descending order_by support (either function names or aliases)
     funcs = cats["functions"]
-    fn_names = set(funcs.keys())
-    has_desc = any(n in fn_names for n in ("order_by_desc", "orderby_desc"))
-    has_asc  = any(n in fn_names for n in ("order_by", "orderby"))
+    fn_names = funcs.keys()
+    has_desc = not _DESC_NAMES.isdisjoint(fn_names)
+    has_asc  = not _ASC_NAMES.isdisjoint(fn_names)
     assert has_desc, "Binder missing a descending order_by function (e.g., 'order_by_desc')."
     assert has_asc,  "Binder missing an ascending order_by function (e.g., 'order_by')."
 
 def test_grammar_text_contract(grammar_text: str):
     assert grammar_text.strip(), "Grammar file is empty."
     # No quoted placeholders like "table"/"columns"/"value"
-    banned = [r'"table"', r'"columns"', r'"value"']
-    for b in banned:
-        assert re.search(b, grammar_text) is None, f'Grammar contains quoted placeholder {b}'
+    m = _BANNED_RE.search(grammar_text)
+    assert m is None, f"Grammar contains quoted placeholder {m.group()!r}"
     # No ellipses (either unicode … or triple dots ...)
     assert "…" not in grammar_text, "Grammar contains unicode ellipsis (…)."
     assert "..." not in grammar_text, "Grammar contains '...' ellipsis."
@@ -1,6 +1,7 @@
 # tests/test_constraints_in_operator_forms.py
 from __future__ import annotations
 from typing import Dict, Any
+from lark import Lark
 from vbg_tools.graph_runtime import map_text
 from vbg_tools.sql_helpers import build_select_sql_from_slots
 
@@ -48,26 +49,30 @@ query: SELECT FROM | SELECT projection FROM
 %import common.WS
 %ignore WS
 """
+# TEST_GRAMMAR is unambiguous, so the linear-time LALR parser is enough here;
+# compile it once and hand the same parser to every map_text call
+TEST_PARSER = "lalr"
+_PARSER = Lark(TEST_GRAMMAR, parser=TEST_PARSER, cache=True)
 
 def test_in_list_and_like_and_null_checks():
     # IN list
-    rr1 = map_text("show count of age from users age in 5, 10", TEST_VOCAB, TEST_BINDER, TEST_GRAMMAR, want_tree=False)
+    rr1 = map_text("show count of age from users age in 5, 10", TEST_VOCAB, TEST_BINDER, TEST_GRAMMAR, want_tree=False, parser=_PARSER)
     assert rr1.parse_ok
     cs1 = rr1.slots.get("constraints") or []
     assert cs1 and cs1[0]["op"] == "in" and cs1[0]["values"] == ["5", "10"]
 
     # LIKE
-    rr2 = map_text("show count of name from users name like 'a%'", TEST_VOCAB, TEST_BINDER, TEST_GRAMMAR, want_tree=False)
+    rr2 = map_text("show count of name from users name like 'a%'", TEST_VOCAB, TEST_BINDER, TEST_GRAMMAR, want_tree=False, parser=_PARSER)
     cs2 = rr2.slots.get("constraints") or []
     assert cs2 and cs2[0]["op"] == "like" and cs2[0]["values"] == ["a%"]
 
     # IS NULL
-    rr3 = map_text("show count of age from users age is null", TEST_VOCAB, TEST_BINDER, TEST_GRAMMAR, want_tree=False)
+    rr3 = map_text("show count of age from users age is null", TEST_VOCAB, TEST_BINDER, TEST_GRAMMAR, want_tree=False, parser=_PARSER)
     cs3 = rr3.slots.get("constraints") or []
     assert cs3 and cs3[0]["op"] == "is_null" and cs3[0]["values"] == []
 
     # IS NOT NULL
-    rr4 = map_text("show count of age from users age is not null", TEST_VOCAB, TEST_BINDER, TEST_GRAMMAR, want_tree=False)
+    rr4 = map_text("show count of age from users age is not null", TEST_VOCAB, TEST_BINDER, TEST_GRAMMAR, want_tree=False, parser=_PARSER)
     cs4 = rr4.slots.get("constraints") or []
     assert cs4 and cs4[0]["op"] == "is_not_null" and cs4[0]["values"] == []
 
@@ -2,21 +2,37 @@
 from __future__ import annotations
 
 import os
+import re
+from functools import lru_cache
 import stat
 from pathlib import Path
-import textwrap
 import yaml
 
 import pytest
 
+from vbg_tools.artifact_helpers import _Dumper
 from vbg_tools.create_cli_test import generate_cli_test
 
 def _write_yaml(path: Path, obj):
     path.parent.mkdir(parents=True, exist_ok=True)
     with open(path, "w", encoding="utf-8") as f:
-        yaml.safe_dump(obj, f, sort_keys=False)
+        yaml.dump(obj, f, Dumper=_Dumper, sort_keys=False)
 
-def _minimal_artifacts(tmp: Path):
+_SCRIPT_MARKERS = (
+    "featured: ", "first", "from users", "from sales", "show from users", "display from users",
+    "# expected path 1:", "# expected path 2:", "frobnicate the widgets",
+)
+_SECTION_HEADERS = ("gold surfaces", "multipath surfaces", "invalid surfaces")
+
+def _marker_re(markers) -> re.Pattern:
+    # Zero-width lookahead reports overlapping hits too ("from users" inside "show from users")
+    return re.compile("(?=(" + "|".join(map(re.escape, markers)) + "))")
+
+_SCRIPT_MARKER_RE = _marker_re(_SCRIPT_MARKERS)
+_SECTION_HEADER_RE = _marker_re(_SECTION_HEADERS)
+
+@lru_cache(maxsize=None)
+def _minimal_artifact_texts():
     # vocabulary with connectors + select verbs + basic actions
     vocab = {
         "keywords": {
@@ -39,8 +55,15 @@ def _minimal_artifacts(tmp: Path):
             "connectors": {"AND": "and", "OR": "or", "FROM": "from", "OF": "of", "COMMA": ","},
         }
     }
-    _write_yaml(tmp / "graph_vocabulary.yaml", vocab)
-    _write_yaml(tmp / "graph_binder.yaml", binder)
+    return (yaml.dump(vocab, Dumper=_Dumper, sort_keys=False),
+            yaml.dump(binder, Dumper=_Dumper, sort_keys=False))
+
+def _minimal_artifacts(tmp: Path):
+    # Every test uses the same vocab/binder; serialize once, write the cached text per test
+    vocab_text, binder_text = _minimal_artifact_texts()
+    tmp.mkdir(parents=True, exist_ok=True)
+    (tmp / "graph_vocabulary.yaml").write_text(vocab_text, encoding="utf-8")
+    (tmp / "graph_binder.yaml").write_text(binder_text, encoding="utf-8")
 
 def _surfaces_files(tmp: Path):
     gold = [
@@ -74,25 +97,20 @@ def test_generates_executable_script_and_sections(tmp_path: Path, monkeypatch: p
     assert mode & stat.S_IXUSR, "cli_test.sh should be executable by user"
 
     text = script_path.read_text(encoding="utf-8")
+    # One scan each instead of a separate substring search per marker
+    found = set(_SCRIPT_MARKER_RE.findall(text))
+    found_lc = set(_SECTION_HEADER_RE.findall(text.lower()))
 
     # Featured section: must include a 'first' example (limit_one) against an existing table.
-    assert "featured: " in text
-    assert "first" in text
-    assert "from users" in text or "from sales" in text
-
-    # Gold surfaces present and echoed
-    assert "Gold surfaces" in text or "Gold surfaces".lower() in text.lower()
-    assert "show from users" in text
+    assert {"featured: ", "first"} <= found
+    assert found & {"from users", "from sales"}
 
-    # Multipath NL lines present with expected-path comments
-    assert "Multipath surfaces" in text or "Multipath surfaces".lower() in text.lower()
-    assert "display from users" in text
-    assert "# expected path 1:" in text
-    assert "# expected path 2:" in text
+    # Gold / multipath / invalid section headers (case-insensitive)
+    assert found_lc == set(_SECTION_HEADERS)
 
-    # Invalid section contains warning logic
-    assert "Invalid surfaces" in text or "Invalid surfaces".lower() in text.lower()
-    assert "frobnicate the widgets" in text
+    # Gold surfaces echoed; multipath NL lines with expected-path comments; invalid NL echoed
+    assert {"show from users", "display from users", "# expected path 1:", "# expected path 2:",
+            "frobnicate the widgets"} <= found
 
 def test_single_quote_escaping(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
     out_dir = tmp_path / "out"
@@ -115,9 +133,11 @@ def test_single_quote_escaping(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
 def test_max_items_limits_gold(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
     out_dir = tmp_path / "out"
     _minimal_artifacts(out_dir)
-    _write_yaml(out_dir / "gold_surfaces.yml", [
-        {"natural_language": f"query {i}", "sql_expression": f"SELECT {i}"} for i in range(10)
-    ])
+    # Shape is fixed, so write the YAML text directly instead of going through the emitter
+    (out_dir / "gold_surfaces.yml").write_text(
+        "".join(f"- natural_language: query {i}\n  sql_expression: SELECT {i}\n" for i in range(10)),
+        encoding="utf-8",
+    )
     _write_yaml(out_dir / "multipath_surfaces.yml", [])
     _write_yaml(out_dir / "invalid_surfaces.yml", [])
 
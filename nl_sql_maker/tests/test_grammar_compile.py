@@ -1,11 +1,6 @@
 # tests/test_grammar_compile.py
 from __future__ import annotations
-import pytest
 
-def test_grammar_compiles(grammar_text):
-    try:
-        from lark import Lark
-    except Exception as e:
-        pytest.skip(f"Lark not available: {e!r}")
-    # Try compiling with common start rule 'query'
-    Lark(grammar_text, start="query", parser="lalr")
+def test_grammar_compiles(lark_parser):
+    # The session fixture compiles with common start rule 'query' (skips if Lark is missing)
+    assert lark_parser is not None
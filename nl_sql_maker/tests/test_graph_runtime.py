@@ -1,5 +1,6 @@
 # tests/test_graph_runtime.py  — DROP-IN (keeps your original tests; adds one extra)
 
+import copy
 import sys
 from pathlib import Path
 
@@ -85,6 +86,20 @@ query: SELECT FROM
 %ignore WS
 """
 
+@pytest.fixture(scope="module")
+def lex_trie():
+    """Lexicon, connectors and alias trie for TEST_VOCAB, built once per module."""
+    lex, conns = build_lexicon_and_connectors(TEST_VOCAB)
+    trie, max_len = build_index(lex)
+    return lex, conns, trie, max_len
+
+def _first_positions(cts):
+    """First index of each canonical token, gathered in one pass."""
+    first = {}
+    for i, t in enumerate(cts):
+        first.setdefault(t, i)
+    return first
+
 # ------------------------
 # Unit tests
 # ------------------------
@@ -98,8 +113,8 @@ def test_tokenize_and_primitives():
     assert is_quoted_string('"x y"') == "x y"
     assert is_quoted_string("nope") is None
 
-def test_build_lexicon_and_connectors_basics():
-    lex, conns = build_lexicon_and_connectors(TEST_VOCAB)
+def test_build_lexicon_and_connectors_basics(lex_trie):
+    lex, conns, _, _ = lex_trie
     assert conns["AND"] == "and"
     assert conns["FROM"] == "from"
     tokensets = {le.tokens for le in lex}
@@ -109,14 +124,20 @@ def test_build_lexicon_and_connectors_basics():
 def test_build_index_and_greedy_match_longest():
     le_long = LexEntry(tokens=("greater","than"), canonical="greater_than", role="comparator", surface="greater than")
     le_short = LexEntry(tokens=("greater",), canonical="greater", role="comparator", surface="greater")
-    by_len, max_len = build_index([le_long, le_short])
+    trie, max_len = build_index([le_long, le_short])
 
     toks = ["price", "greater", "than", "10"]
-    spans = match_aliases(toks, by_len, max_len)
+    spans = match_aliases(toks, trie, max_len)
     assert len(spans) == 1
     assert spans[0].canonical == "greater_than"
     assert spans[0].start == 1 and spans[0].end == 3
 
+def test_match_aliases_on_vocab_trie(lex_trie):
+    _, _, trie, max_len = lex_trie
+    spans = match_aliases(tokenize("show the count of age"), trie, max_len)
+    assert [s.canonical for s in spans][0] == "select"
+    assert any(s.surface == "count of" and s.end - s.start == 2 for s in spans)
+
 def test_infer_column_types_numeric_vs_id():
     cinfo_id = {"type": "integer"}
     types_id = infer_column_types(cinfo_id, "user_id")
@@ -146,11 +167,13 @@ def test_harvest_and_canonicalize_adds_FROM_and_builds_slots():
     cts = res.canonical_tokens
     assert cts[0] == "SELECT"
     assert "FROM" in cts
-    if "VALUE" in cts:
-        assert cts.index("VALUE") < cts.index("FROM")
+    pos = _first_positions(cts)
+    if "VALUE" in pos:
+        assert pos["VALUE"] < pos["FROM"]
 
     assert res.slots["table"] == "users"
-    assert any("Unmapped tokens" in w for w in res.warnings)
+    assert res.unmapped_tokens == ["users"]
+    assert res.warnings == [f"Unmapped tokens: {res.unmapped_tokens}"]
 
 def test_try_parse_with_lark_success():
     ok, err, tree = try_parse_with_lark(TEST_GRAMMAR, ["SELECT", "FROM"], want_tree=True)
@@ -158,6 +181,27 @@ def test_try_parse_with_lark_success():
     assert "query" in tree
     assert "SELECT" in tree and "FROM" in tree
 
+def test_try_parse_with_lark_lalr_matches_earley():
+    for toks in (["SELECT", "FROM"], ["SELECT", "count", "OF", "VALUE", "FROM"], ["FROM", "SELECT"]):
+        ok_e, _, _ = try_parse_with_lark(TEST_GRAMMAR, toks, want_tree=False)
+        ok_l, _, _ = try_parse_with_lark(TEST_GRAMMAR, toks, want_tree=False, parser_algorithm="lalr")
+        assert ok_e == ok_l
+
+def test_try_parse_with_lark_auto_prefers_lalr_and_falls_back_to_earley():
+    from vbg_tools.graph_runtime import _compile_lark
+    assert _compile_lark(TEST_GRAMMAR, "auto").options.parser == "lalr"
+    ambiguous = 'start: a | b\na: "x"\nb: "x"\n'
+    assert _compile_lark(ambiguous, "auto").options.parser == "earley"
+    ok, err, _ = try_parse_with_lark(ambiguous, ["x"], want_tree=False)
+    assert ok and err is None
+
+def test_try_parse_with_lark_reuses_compiled_parser():
+    from vbg_tools.graph_runtime import _compile_lark
+    try_parse_with_lark(TEST_GRAMMAR, ["SELECT", "FROM"], want_tree=False)
+    hits = _compile_lark.cache_info().hits
+    ok, _, _ = try_parse_with_lark(TEST_GRAMMAR, ["SELECT", "FROM"], want_tree=False)
+    assert ok and _compile_lark.cache_info().hits == hits + 1
+
 def test_map_text_end_to_end_select_from():
     res = map_text("show users", TEST_VOCAB, TEST_BINDER, TEST_GRAMMAR, want_tree=False)
 
@@ -165,16 +209,88 @@ def test_map_text_end_to_end_select_from():
     assert cts[0] == "SELECT"
     assert "FROM" in cts
 
-    if "VALUE" in cts:
-        assert cts.index("VALUE") < cts.index("FROM")
+    pos = _first_positions(cts)
+    if "VALUE" in pos:
+        assert pos["VALUE"] < pos["FROM"]
     else:
         assert res.parse_ok is True
 
     assert res.slots["table"] == "users"
 
+def test_map_text_reuses_prebuilt_vocab_index_and_sees_vocab_edits(monkeypatch):
+    import vbg_tools.graph_runtime as gr
+    vocab = copy.deepcopy(TEST_VOCAB)
+    vocab_index = gr.build_vocab_index(vocab)
+    calls = []
+    real = gr.build_lexicon_and_connectors
+    monkeypatch.setattr(gr, "build_lexicon_and_connectors", lambda v: calls.append(1) or real(v))
+    for text in ("show users", "list users"):
+        assert map_text(text, vocab, TEST_BINDER, TEST_GRAMMAR, vocab_index=vocab_index).canonical_tokens[0] == "SELECT"
+    assert calls == []
+
+    # Without a prebuilt index, in-place vocabulary edits are picked up on the next call
+    assert map_text("display users", vocab, TEST_BINDER, TEST_GRAMMAR).canonical_tokens == ["FROM"]
+    vocab["keywords"]["select_verbs"]["select"]["aliases"].append("display")
+    assert map_text("display users", vocab, TEST_BINDER, TEST_GRAMMAR).canonical_tokens == ["SELECT", "FROM"]
+
+def test_map_text_reuses_prebuilt_schema_index_and_sees_binder_edits(monkeypatch):
+    import vbg_tools.graph_runtime as gr
+    binder = copy.deepcopy(TEST_BINDER)
+    schema_index = build_schema_indices(binder)
+    calls = []
+    real = gr.build_schema_indices
+    monkeypatch.setattr(gr, "build_schema_indices", lambda b: calls.append(1) or real(b))
+    for text in ("show users", "show count of age from users"):
+        assert map_text(text, TEST_VOCAB, binder, TEST_GRAMMAR, schema_index=schema_index).slots["table"] == "users"
+    assert calls == []
+
+    # Without a prebuilt index, in-place binder edits are picked up on the next call
+    assert map_text("show orders", TEST_VOCAB, binder, TEST_GRAMMAR).slots["table"] is None
+    binder["catalogs"]["tables"]["orders"] = {}
+    assert map_text("show orders", TEST_VOCAB, binder, TEST_GRAMMAR).slots["table"] == "orders"
+
+def test_run_tests_builds_indices_once_per_run(monkeypatch):
+    import vbg_tools.graph_runtime as gr
+    calls = {"vocab": 0, "schema": 0}
+    real_vocab, real_schema = gr.build_vocab_index, gr.build_schema_indices
+    def _vocab(v):
+        calls["vocab"] += 1
+        return real_vocab(v)
+    def _schema(b):
+        calls["schema"] += 1
+        return real_schema(b)
+    monkeypatch.setattr(gr, "build_vocab_index", _vocab)
+    monkeypatch.setattr(gr, "build_schema_indices", _schema)
+    cases = [
+        gr.ParseCase(label=f"c{i}", utterance=text, tokens_regex="SELECT", want_parse_ok=True)
+        for i, text in enumerate(("show users", "list users", "show count of age from users"))
+    ]
+    _exit_code, counts = gr.run_tests(
+        vocab_yaml=TEST_VOCAB, binder_yaml=TEST_BINDER, grammar_text=TEST_GRAMMAR,
+        db_path=None, limit=5, parse_cases=cases, sql_cases=[],
+    )
+    assert counts["total"] == 3
+    assert calls == {"vocab": 1, "schema": 1}
+
 def test_map_text_projection_value_before_from():
     res = map_text("show count of age from users", TEST_VOCAB, TEST_BINDER, TEST_GRAMMAR, want_tree=False)
     cts = res.canonical_tokens
-    if "VALUE" in cts:
-        assert cts.index("VALUE") < cts.index("FROM")
+    pos = _first_positions(cts)
+    if "VALUE" in pos:
+        assert pos["VALUE"] < pos["FROM"]
     assert res.slots["table"] == "users"
+
+def test_map_text_leaves_shared_inputs_untouched():
+    # The module constants are shared by every test; map_text must treat them as read-only.
+    before = copy.deepcopy((TEST_VOCAB, TEST_BINDER))
+    map_text("show count of age from users where age greater than 3", TEST_VOCAB, TEST_BINDER, TEST_GRAMMAR)
+    assert (TEST_VOCAB, TEST_BINDER) == before
+
+def test_inproc_runtime_cmd_drives_the_runtime_main(art_dir, monkeypatch, run_runtime_json):
+    # RUNTIME_PARSE_CMD="python:<module>:<function>" calls the target like a CLI main with [nl, "--json"]
+    import vbg_tools.graph_runtime as gr
+    monkeypatch.setattr(gr, "ART_DIR", art_dir)
+    monkeypatch.setenv("AUTO_BUILD_ARTIFACTS", "0")
+    payload = run_runtime_json("python:vbg_tools.graph_runtime:main", "show users")
+    assert payload["parse_ok"] is True
+    assert payload["canonical_tokens"][0] == "SELECT"
@@ -3,8 +3,10 @@ from __future__ import annotations
 from pathlib import Path
 import os
 import yaml
+
 import pytest
 
+from vbg_tools.artifact_helpers import _Dumper
 from vbg_tools.runtime_helper import (
     resolve_artifact_paths,
     artifacts_exist,
@@ -15,7 +17,7 @@ from vbg_tools.runtime_helper import (
 def _write_yaml(path: Path, obj):
     path.parent.mkdir(parents=True, exist_ok=True)
     with open(path, "w", encoding="utf-8") as f:
-        yaml.safe_dump(obj, f, sort_keys=False, allow_unicode=True)
+        yaml.dump(obj, f, Dumper=_Dumper, sort_keys=False, allow_unicode=True)
 
 def _minimal_inputs(dirpath: Path):
     """
@@ -74,12 +74,36 @@ def test_build_lexicon_includes_select_verbs_connectors_and_actions():
 def test_greedy_match_prefers_longer_action_alias():
     # Build lexicon & index
     lex, _ = build_lexicon_and_connectors(TEST_VOCAB)
-    by_len, max_len = build_index(lex)
+    trie, max_len = build_index(lex)
 
     # "order by" vs "order" → should match the 2-token alias
     toks = ["please", "order", "by", "value"]
-    spans = match_aliases(toks, by_len, max_len)
+    spans = match_aliases(toks, trie, max_len)
 
     # Expect one match covering "order by" (positions 1..3)
     assert any(s.canonical == "order_by_asc" and s.start == 1 and s.end == 3 for s in spans), \
         f"Expected longest match for 'order by'; got: {[(s.canonical, s.start, s.end) for s in spans]}"
+
+def test_lex_entries_are_slotted_and_share_canonical_strings():
+    import pickle
+    lex, conns = build_lexicon_and_connectors(TEST_VOCAB)
+    assert all(k is sys.intern(k) and v is sys.intern(v) for k, v in conns.items())
+    counts = [le for le in lex if le.canonical == "count"]
+    assert len(counts) == 3
+    assert all(le.canonical is counts[0].canonical for le in counts)
+    assert not hasattr(counts[0], "__dict__")
+    assert pickle.loads(pickle.dumps(counts[1])) == counts[1]
+
+def test_build_index_keeps_first_entry_for_duplicate_tokens():
+    from vbg_tools.runtime_nlp import LexEntry
+    first = LexEntry(tokens=("count",), canonical="count", role="sql_action", surface="count")
+    dup = LexEntry(tokens=("count",), canonical="count_distinct", role="sql_action", surface="count")
+    trie, max_len = build_index([first, dup])
+    spans = match_aliases(["count", "users"], trie, max_len)
+    assert max_len == 1
+    assert [s.canonical for s in spans] == ["count"]
+
+def test_tokenize_lowercases_ascii_and_non_ascii_alike():
+    from vbg_tools.runtime_nlp import tokenize
+    assert tokenize("Show Users, DON'T stop") == ["show", "users", ",", "don't", "stop"]
+    assert tokenize("Şehir İstanbul, ÉTÉ") == ["şehir", "i̇stanbul", ",", "été"]
@@ -2,9 +2,10 @@
 from __future__ import annotations
 
 import re
+import sqlite3
 import pytest
 
-from vbg_tools.sql_helpers import build_select_sql_from_slots
+from vbg_tools.sql_helpers import build_select_sql_from_slots, execute_sqlite
 
 # Minimal binder with functions & columns your builder expects
 BINDER = {
@@ -135,3 +136,18 @@ def test_between_and_in_constraints():
         'LIMIT 25'
     )
     assert _squash_ws(sql) == _squash_ws(want)
+
+
+def test_execute_sqlite_accepts_in_memory_uri():
+    uri = "file:vbg_sql_helpers_test?mode=memory&cache=shared"
+    # The shared in-memory DB lives as long as one connection stays open
+    keeper = sqlite3.connect(uri, uri=True)
+    try:
+        keeper.executescript(
+            'CREATE TABLE "users" ("user_id" INTEGER, "username" TEXT);'
+            "INSERT INTO \"users\" VALUES (1, 'alice'), (2, 'bob');"
+        )
+        res = execute_sqlite(uri, 'SELECT COUNT(*) AS n FROM "users"')
+        assert res["rows"] == [{"n": 2}]
+    finally:
+        keeper.close()
@@ -35,8 +35,7 @@ def _binder_numeric_date_text():
     }
 
 def _spec(func="sum", table="sales", column="sales.price"):
-    return SQLSpec(func=func, arg_key="column", table=table, column=column,
-                   expression_sql=f'SELECT {func.upper()}("sales"."price") FROM "sales"')
+    return SQLSpec(func=func, arg_key="column", table=table, column=column)
 
 def test_predicate_phrases_for_numeric_include_between_gt_lt():
     vocab = _vocab()
@@ -51,15 +50,13 @@ def test_predicate_phrases_for_numeric_include_between_gt_lt():
 def test_predicate_phrases_for_date_include_between():
     vocab = _vocab()
     binder = _binder_numeric_date_text()
-    spec = SQLSpec(func="count", arg_key="column", table="users", column="users.dob",
-                   expression_sql='SELECT COUNT("users"."dob") FROM "users"')
+    spec = SQLSpec(func="count", arg_key="column", table="users", column="users.dob")
     preds = render_predicate_phrases(spec, vocab, binder)
     assert any("between" in p.lower() for p in preds)
 
 def test_no_predicates_for_text_columns():
     vocab = _vocab()
     binder = _binder_numeric_date_text()
-    spec = SQLSpec(func="count", arg_key="column", table="users", column="users.name",
-                   expression_sql='SELECT COUNT("users"."name") FROM "users"')
+    spec = SQLSpec(func="count", arg_key="column", table="users", column="users.name")
     preds = render_predicate_phrases(spec, vocab, binder)
     assert preds == [] or len(preds) == 0
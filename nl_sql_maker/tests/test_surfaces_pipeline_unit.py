@@ -1,6 +1,7 @@
 import pytest
 from pathlib import Path
-from vbg_tools.surfaces_pipeline import generate_surfaces, PipelineConfig
+import yaml
+from vbg_tools.surfaces_pipeline import generate_surfaces, PipelineConfig, _load_artifacts
 
 def _grammar_for_actions(actions=("count","sum")):
     acts = " | ".join(f'"{a}"i' for a in actions)
@@ -93,3 +94,39 @@ def test_pipeline_respects_applicability_gate(tmp_path: Path):
     vocab["sql_actions"]["sum"]["applicable_types"] = {"column": ["numeric"]}
     bundle2 = generate_surfaces(vocab, binder, grammar, config=cfg)
     assert bundle2.gold
+
+def test_load_artifacts_reads_all_three_files(tmp_path: Path):
+    vp, bp, gp = tmp_path / "v.yaml", tmp_path / "b.yaml", tmp_path / "g.lark"
+    vp.write_text(yaml.safe_dump(_vocab_predicate_ready()), encoding="utf-8")
+    bp.write_text(yaml.safe_dump(_binder_numeric_minimal()), encoding="utf-8")
+    gp.write_text(_grammar_for_actions(), encoding="utf-8")
+
+    vocab, binder, grammar = _load_artifacts(vp, bp, gp)
+    assert vocab == _vocab_predicate_ready()
+    assert binder == _binder_numeric_minimal()
+    assert grammar == _grammar_for_actions()
+
+    with pytest.raises(FileNotFoundError):
+        _load_artifacts(tmp_path / "missing.yaml", bp, gp)
+
+def test_load_artifacts_leaves_no_side_files(tmp_path: Path):
+    vp, bp, gp = tmp_path / "v.yaml", tmp_path / "b.yaml", tmp_path / "g.lark"
+    vp.write_text(yaml.safe_dump({"a": 1}), encoding="utf-8")
+    bp.write_text(yaml.safe_dump({"b": 2}), encoding="utf-8")
+    gp.write_text("start: query", encoding="utf-8")
+
+    assert _load_artifacts(vp, bp, gp)[0] == {"a": 1}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["b.yaml", "g.lark", "v.yaml"]
+
+    vp.write_text(yaml.safe_dump({"a": 2}), encoding="utf-8")
+    assert _load_artifacts(vp, bp, gp)[0] == {"a": 2}
+
+
+def test_inproc_surfaces_cmd_drives_the_pipeline_main(art_dir, tmp_path, run_surfaces_cmd):
+    # SURFACES_CMD="python:<module>:<function>" calls the target like a CLI main with an argv list
+    import shutil
+    for name in ("graph_vocabulary.yaml", "graph_binder.yaml", "graph_grammar.lark"):
+        shutil.copy(art_dir / name, tmp_path / name)
+    run_surfaces_cmd("python:vbg_tools.surfaces_pipeline:main", tmp_path)
+    for name in ("gold_surfaces.yml", "multipath_surfaces.yml", "invalid_surfaces.yml"):
+        assert (tmp_path / name).exists()
@@ -1,5 +1,5 @@
 import pytest
-from vbg_tools.surfaces_spec_builder import enumerate_specs, SQLSpec, column_slot_types
+from vbg_tools.surfaces_spec_builder import enumerate_specs, SQLSpec, column_slot_types, build_binder_index, dbtype_to_slot_types
 
 def _minimal_vocab_no_applicable():
     return {
@@ -50,8 +50,61 @@ def test_specs_appear_with_applicable_types_any_and_numeric():
     cols = {s.column for s in specs}
     assert "users.age" in cols or "sales.price" in cols
 
+def test_in_place_vocab_edits_are_seen_by_the_next_enumeration():
+    vocab = _minimal_vocab_with_applicable()
+    del vocab["sql_actions"]["count"]
+    binder = _binder_numeric_and_text()
+    assert {s.func for s in enumerate_specs(binder, vocab, max_specs=100)} == {"sum"}
+    vocab["sql_actions"]["avg"] = {
+        "placement": "projection", "aliases": ["avg"], "template": "AVG({column})",
+        "applicable_types": {"column": ["numeric"]},
+    }
+    assert {s.func for s in enumerate_specs(binder, vocab, max_specs=100)} == {"sum", "avg"}
+
+def test_applicable_types_decides_over_stale_derived_fields():
+    vocab = _minimal_vocab_with_applicable()
+    vocab["sql_actions"]["sum"].update(has_any_arg=True, required_by_arg_lower={"column": ["any"]})
+    specs = enumerate_specs(_binder_numeric_and_text(), vocab, max_specs=100)
+    assert {s.column for s in specs if s.func == "sum"} == {"users.user_id", "users.age", "sales.price"}
+
 def test_column_slot_types_from_db_type_and_explicit():
     binder = _binder_numeric_and_text()
     assert "numeric" in column_slot_types(binder, "users.age")
     assert "text" in column_slot_types(binder, "users.name")
     assert column_slot_types(binder, "users.missing") == set()
+
+def test_binder_index_matches_per_column_lookup_and_is_reusable():
+    vocab = _minimal_vocab_with_applicable()
+    binder = _binder_numeric_and_text()
+    index = build_binder_index(binder)
+    assert [fq for t, fq in index.columns if t == "users"] == ["users.user_id", "users.age", "users.name"]
+    with pytest.raises(TypeError):
+        index.slot_types_by_fqcol["users.age"] = frozenset()
+    for fq in binder["catalogs"]["columns"]:
+        assert set(index.slot_types_by_fqcol[fq]) == column_slot_types(binder, fq)
+    assert enumerate_specs(binder, vocab, max_specs=100, index=index) == enumerate_specs(binder, vocab, max_specs=100)
+
+def test_enumerate_specs_rejects_index_from_another_binder():
+    vocab = _minimal_vocab_with_applicable()
+    index = build_binder_index(_binder_numeric_and_text())
+    with pytest.raises(ValueError):
+        enumerate_specs(_binder_numeric_and_text(), vocab, index=index)
+
+def test_expression_sql_built_on_demand():
+    spec = SQLSpec(func="sum", arg_key="column", table="sales", column="sales.price")
+    assert spec.expression_sql == 'SELECT SUM("sales"."price") FROM "sales"'
+    distinct = spec._replace(func="distinct")
+    assert distinct.expression_sql == 'SELECT DISTINCT "sales"."price" FROM "sales"'
+
+@pytest.mark.parametrize("db_type,expected", [
+    ("BIGINT", "numeric"), ("timestamptz", "date"), ("boolean", "boolean"),
+    ("geography", "geometry"), ("varchar", "text"), ("user_id", "id"),
+    # type arguments are ignored: "point" would otherwise hit the "int" hint
+    ("geometry(Point, 4326)", "geometry"), ("DECIMAL(10, 2)", "numeric"),
+    ("timestamp(3) with time zone", "date"), ("varchar(50)", "text"),
+    ("", "text"),
+    # overlapping hints resolve by bucket order, not by leftmost match
+    ("jsonumber", "text"), ("uuidecimal", "numeric"),
+])
+def test_dbtype_first_char_dispatch_agrees_with_scan(db_type, expected):
+    assert dbtype_to_slot_types(db_type) == {expected}
@@ -7,6 +7,7 @@ from vbg_tools.synth_artifacts import (
     build_vocabulary,
     build_binder,
     build_grammar,
+    _slot_types_from_types_list,
 )
 
 
@@ -59,6 +60,9 @@ def test_build_vocabulary_merges_actions_and_connectors_present():
         assert k in kw["connectors"]
     actions = kw["sql_actions"]
     assert {"count", "sum"}.issubset(actions.keys())
+    # Only applicable_types is written; requirement lookups are derived from it at enumeration time
+    assert actions["sum"]["applicable_types"] == {"column": ["numeric"]}
+    assert not {"has_any_arg", "required_by_arg_lower"} & actions["sum"].keys()
 
 
 def test_build_binder_normalizes_all_brace_polluted_keys():
@@ -104,3 +108,9 @@ def test_build_binder_regression_guard_nested_dictlike_keys():
     binder = build_binder(_schema_with_top_and_nested_broken(), vocab)
     cols = binder["catalogs"]["columns"]
     assert not any("{" in k or "}" in k for k in cols)
+
+
+def test_slot_types_overlapping_hints_follow_bucket_order():
+    # "jsonumber" holds both "json" and "number"; numeric is checked first.
+    assert _slot_types_from_types_list(["jsonumber"]) == ["numeric"]
+    assert _slot_types_from_types_list(["uuidecimal"]) == ["numeric"]